@@ -0,0 +1,203 @@
+"""Parquet-backed storage for the uploaded dataset."""
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional
+import logging
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Default dataset directory
+DATASET_DIR = Path(tempfile.gettempdir()) / "eureka"
+
+
+class DatasetStore:
+    """
+    Keeps the current dataset on disk as a Parquet file.
+
+    Only lightweight metadata (path, columns, row count) stays in memory;
+    columns are read back lazily, projected to what the caller needs.
+    """
+
+    def __init__(self, dataset_dir: Optional[Path] = None):
+        self.dataset_dir = dataset_dir or DATASET_DIR
+        self.dataset_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.dataset_dir / "current.parquet"
+        self.meta: Optional[Dict[str, Any]] = None
+        self._column_set: frozenset = frozenset()
+        # Bumped on every save/clear so callers can key caches on it
+        self.version = 0
+        # Makes swapping the file and updating meta/version one step, so
+        # concurrent uploads cannot leave them describing different datasets
+        self._lock = threading.Lock()
+        logger.info(f"DatasetStore initialized with dir: {self.dataset_dir}")
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether a dataset is currently stored."""
+        return self.meta is not None
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names of the current dataset."""
+        return self.meta["columns"] if self.meta else []
+
+    @property
+    def column_set(self) -> frozenset:
+        """Column names as a frozenset, built once per dataset for membership checks."""
+        return self._column_set
+
+    @property
+    def rows(self) -> int:
+        """Row count of the current dataset."""
+        return self.meta["rows"] if self.meta else 0
+
+    def save(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Persist a dataset, replacing the current one.
+
+        Args:
+            df: Uploaded dataset
+
+        Returns:
+            meta: Metadata of the stored dataset
+        """
+        # Write beside and swap in, so readers streaming the previous file
+        # keep a consistent snapshot; each save gets its own temporary file
+        fd, tmp_name = tempfile.mkstemp(dir=self.dataset_dir, suffix=".parquet.tmp")
+        os.close(fd)
+        try:
+            df.to_parquet(tmp_name, index=False)
+            meta = {
+                "path": str(self.path),
+                "columns": list(df.columns),
+                "rows": len(df),
+            }
+            with self._lock:
+                os.replace(tmp_name, self.path)
+                self.meta = meta
+                self._column_set = frozenset(meta["columns"])
+                self.version += 1
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        logger.info(f"Stored dataset with {meta['rows']} rows at {self.path}")
+        return meta
+
+    def load(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read the stored dataset.
+
+        Args:
+            columns: Optional column projection; only these are read from disk
+
+        Returns:
+            DataFrame with the requested columns
+        """
+        if self.meta is None:
+            raise FileNotFoundError("No dataset loaded")
+
+        dataset = ds.dataset(self.path, format="parquet")
+        return dataset.to_table(columns=columns).to_pandas()
+
+    def load_columns(self, columns: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Read columns straight into NumPy, skipping the DataFrame.
+
+        Numeric columns without nulls come back as zero-copy (read-only)
+        views over the Arrow buffers.
+
+        Args:
+            columns: Columns to read from disk
+
+        Returns:
+            Mapping of column name to 1-D array
+        """
+        if self.meta is None:
+            raise FileNotFoundError("No dataset loaded")
+
+        names = list(dict.fromkeys(columns))
+        table = ds.dataset(self.path, format="parquet").to_table(columns=names)
+        return {name: table.column(name).to_numpy() for name in names}
+
+    def schema(self) -> pa.Schema:
+        """Arrow schema of the stored dataset (read from the file footer)."""
+        if self.meta is None:
+            raise FileNotFoundError("No dataset loaded")
+
+        return pq.read_schema(self.path)
+
+    def iter_batches(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        batch_size: int = 65536
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Stream rows [offset, offset + limit) as Arrow record batches.
+
+        Row groups entirely before ``offset`` are skipped without being read,
+        so memory stays bounded by ``batch_size`` regardless of dataset size.
+
+        Args:
+            offset: First row to return
+            limit: Maximum number of rows (None for all remaining rows)
+            batch_size: Maximum rows per yielded batch
+
+        Yields:
+            Record batches in row order
+        """
+        if self.meta is None:
+            raise FileNotFoundError("No dataset loaded")
+
+        parquet_file = pq.ParquetFile(self.path)
+        remaining = self.rows - offset if limit is None else limit
+
+        # Skip whole row groups that end before the offset
+        row_groups = []
+        skip = offset
+        for i in range(parquet_file.num_row_groups):
+            group_rows = parquet_file.metadata.row_group(i).num_rows
+            if not row_groups and skip >= group_rows:
+                skip -= group_rows
+                continue
+            row_groups.append(i)
+
+        if not row_groups:
+            return
+
+        for batch in parquet_file.iter_batches(batch_size=batch_size, row_groups=row_groups):
+            if remaining <= 0:
+                break
+            if skip >= batch.num_rows:
+                skip -= batch.num_rows
+                continue
+            batch = batch.slice(skip, remaining)
+            skip = 0
+            remaining -= batch.num_rows
+            yield batch
+
+    def clear(self):
+        """Drop the current dataset."""
+        with self._lock:
+            self.meta = None
+            self._column_set = frozenset()
+            self.version += 1
+            self.path.unlink(missing_ok=True)
+
+
+# Global dataset store instance
+dataset_store = DatasetStore()
+
+
+def get_dataset_store() -> DatasetStore:
+    """Get the global dataset store instance."""
+    return dataset_store
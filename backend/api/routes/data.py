@@ -1,16 +1,27 @@
 """Data API Routes"""
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
-import pandas as pd
+from starlette.concurrency import run_in_threadpool
+from typing import List, Dict, Any, Iterator, Optional
+from cachetools import TTLCache
 import io
+import threading
+import orjson
+import pandas as pd
+import pyarrow as pa
+
+from api.dataset_store import get_dataset_store
 
 router = APIRouter()
 
-# In-memory storage for dataset
-current_dataset: Optional[pd.DataFrame] = None
+# Dataset rows live in the Parquet-backed store; only the column config is kept here
 current_config: Optional[Dict[str, Any]] = None
 
+# Serialized /current bodies keyed by dataset version (TTLCache is not thread-safe)
+_current_body_cache: TTLCache = TTLCache(maxsize=4, ttl=300)
+_current_body_lock = threading.Lock()
+
 
 # ============================================
 # Request/Response Models
@@ -27,6 +38,10 @@ class DatasetUpload(BaseModel):
     columns: List[str]
 
 
+class ColumnarUpload(BaseModel):
+    columns: Dict[str, List[Any]]  # column name -> values, in column order
+
+
 class ColumnConfig(BaseModel):
     features: List[str]  # X columns
     target: str  # Y column
@@ -36,62 +51,204 @@ class ColumnConfig(BaseModel):
 # API Endpoints
 # ============================================
 
-@router.post("/upload/csv")
-async def upload_csv(file: UploadFile = File(...)) -> DatasetInfo:
-    """Upload a CSV file and store it in memory."""
-    global current_dataset
-    
+def _dataset_info_response(df: pd.DataFrame) -> ORJSONResponse:
+    """Build the upload response, encoded in a single numpy-aware orjson pass."""
+    return ORJSONResponse({
+        "columns": list(df.columns),
+        "rows": len(df),
+        "preview": df.head(10).to_dict(orient='records'),
+    })
+
+
+async def _store_dataset(df: pd.DataFrame):
+    """Persist an uploaded dataset; disk failures are server errors, not bad input."""
+    try:
+        await run_in_threadpool(get_dataset_store().save, df)
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to store dataset: {str(e)}")
+    except Exception as e:
+        # Columns Parquet cannot represent (e.g. mixed types)
+        raise HTTPException(status_code=400, detail=f"Unsupported dataset: {str(e)}")
+
+
+@router.post("/upload/csv", response_model=DatasetInfo)
+async def upload_csv(file: UploadFile = File(...)) -> ORJSONResponse:
+    """Upload a CSV file and store it as the current dataset."""
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="File must be a CSV")
     
     try:
-        contents = await file.read()
-        df = pd.read_csv(io.StringIO(contents.decode('utf-8')))
-        current_dataset = df
-        
-        return DatasetInfo(
-            columns=list(df.columns),
-            rows=len(df),
-            preview=df.head(10).to_dict(orient='records')
-        )
+        # Parse straight from the spooled upload file (no read/decode/StringIO
+        # copies), off the event loop.
+        df = await run_in_threadpool(pd.read_csv, file.file, engine="pyarrow")
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error parsing CSV: {str(e)}")
+    
+    await _store_dataset(df)
+    return _dataset_info_response(df)
 
 
-@router.post("/upload/json")
-async def upload_json(data: DatasetUpload) -> DatasetInfo:
+@router.post("/upload/json", response_model=DatasetInfo)
+async def upload_json(data: DatasetUpload) -> ORJSONResponse:
     """Upload data as JSON (from grid editor)."""
-    global current_dataset
-    
     try:
         df = pd.DataFrame(data.data)
         # Ensure columns are in the right order
         if data.columns:
             df = df[data.columns]
-        current_dataset = df
-        
-        return DatasetInfo(
-            columns=list(df.columns),
-            rows=len(df),
-            preview=df.head(10).to_dict(orient='records')
-        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error creating dataset: {str(e)}")
+    
+    await _store_dataset(df)
+    return _dataset_info_response(df)
+
+
+@router.post("/upload/columnar", response_model=DatasetInfo)
+async def upload_columnar(payload: ColumnarUpload) -> ORJSONResponse:
+    """Upload data as column arrays (no per-row dicts to build or validate)."""
+    try:
+        df = pd.DataFrame(payload.columns)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error creating dataset: {str(e)}")
+    
+    await _store_dataset(df)
+    return _dataset_info_response(df)
+
+
+def _read_arrow_stream(body: bytes) -> pd.DataFrame:
+    """Decode an Arrow IPC stream body into a DataFrame."""
+    return pa.ipc.open_stream(body).read_all().to_pandas()
+
+
+@router.post("/upload/arrow", response_model=DatasetInfo)
+async def upload_arrow(request: Request) -> ORJSONResponse:
+    """Upload data as a raw Arrow IPC stream body."""
+    body = await request.body()
+    
+    try:
+        df = await run_in_threadpool(_read_arrow_stream, body)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error reading Arrow stream: {str(e)}")
+    
+    await _store_dataset(df)
+    return _dataset_info_response(df)
+
+
+def _serialize_current() -> bytes:
+    """Encode the whole current dataset as the /current JSON body."""
+    store = get_dataset_store()
+    df = store.load()
+    return orjson.dumps({
+        "data": df.to_dict(orient='records'),
+        "columns": store.columns,
+        "rows": store.rows
+    }, option=orjson.OPT_SERIALIZE_NUMPY)
 
 
 @router.get("/current")
-async def get_current_dataset() -> Dict[str, Any]:
-    """Get the current dataset."""
-    global current_dataset
+async def get_current_dataset() -> Response:
+    """Get the current dataset.
     
-    if current_dataset is None:
-        return {"data": [], "columns": [], "rows": 0}
+    Encoded directly with orjson (NaN cells become null) and cached per
+    dataset version, so repeated polling returns the same bytes.
+    """
+    store = get_dataset_store()
     
-    return {
-        "data": current_dataset.to_dict(orient='records'),
-        "columns": list(current_dataset.columns),
-        "rows": len(current_dataset)
-    }
+    if not store.is_loaded:
+        return ORJSONResponse({"data": [], "columns": [], "rows": 0})
+    
+    version = store.version
+    with _current_body_lock:
+        body = _current_body_cache.get(version)
+    
+    if body is None:
+        body = await run_in_threadpool(_serialize_current)
+        with _current_body_lock:
+            _current_body_cache[version] = body
+    
+    return Response(content=body, media_type="application/json")
+
+
+def _column_values(column: pa.Array) -> Any:
+    """Numeric columns go to orjson as NumPy arrays; everything else as lists."""
+    if column.null_count == 0 and (
+        pa.types.is_integer(column.type) or pa.types.is_floating(column.type)
+    ):
+        return column.to_numpy()
+    return column.to_pylist()
+
+
+def _iter_ndjson(offset: int, limit: Optional[int]) -> Iterator[bytes]:
+    """Yield a header line, then one columnar JSON object per record batch."""
+    store = get_dataset_store()
+    yield orjson.dumps({
+        "columns": store.columns,
+        "rows": store.rows,
+        "offset": offset,
+        "limit": limit,
+    }) + b"\n"
+    
+    row = offset
+    for batch in store.iter_batches(offset, limit):
+        yield orjson.dumps({
+            "offset": row,
+            "data": {
+                name: _column_values(column)
+                for name, column in zip(batch.schema.names, batch.columns)
+            },
+        }, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+        row += batch.num_rows
+
+
+@router.get("/current.ndjson")
+async def stream_current_dataset(
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1)
+) -> StreamingResponse:
+    """Stream a page of the current dataset as newline-delimited JSON.
+    
+    The first line describes the dataset; each following line holds one
+    chunk of rows in columnar form: {"offset": n, "data": {column: [...]}}.
+    """
+    if not get_dataset_store().is_loaded:
+        raise HTTPException(status_code=400, detail="No dataset loaded")
+    
+    return StreamingResponse(
+        _iter_ndjson(offset, limit),
+        media_type="application/x-ndjson"
+    )
+
+
+def _iter_arrow_stream() -> Iterator[bytes]:
+    """Write the dataset as an Arrow IPC stream, yielding bytes per batch."""
+    store = get_dataset_store()
+    sink = io.BytesIO()
+    
+    with pa.ipc.new_stream(sink, store.schema()) as writer:
+        for batch in store.iter_batches():
+            writer.write_batch(batch)
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    
+    # End-of-stream marker written on close
+    yield sink.getvalue()
+
+
+@router.get("/current.arrow")
+async def get_current_dataset_arrow() -> StreamingResponse:
+    """Get the current dataset as an Arrow IPC stream.
+    
+    Binary columnar transport for clients using apache-arrow; the JSON
+    /current route remains for existing clients.
+    """
+    if not get_dataset_store().is_loaded:
+        raise HTTPException(status_code=400, detail="No dataset loaded")
+    
+    return StreamingResponse(
+        _iter_arrow_stream(),
+        media_type="application/vnd.apache.arrow.stream"
+    )
 
 
 @router.post("/configure")
@@ -100,14 +257,15 @@ async def configure_columns(config: ColumnConfig) -> Dict[str, Any]:
     
     Returns plain dict to avoid Pydantic validation issues.
     """
-    global current_dataset, current_config
+    global current_config
+    store = get_dataset_store()
     
-    if current_dataset is None:
+    if not store.is_loaded:
         raise HTTPException(status_code=400, detail="No dataset loaded")
     
     # Validate columns exist
-    all_cols = set(config.features + [config.target])
-    missing = all_cols - set(current_dataset.columns)
+    columns = store.column_set
+    missing = [c for c in config.features + [config.target] if c not in columns]
     if missing:
         raise HTTPException(status_code=400, detail=f"Columns not found: {missing}")
     
@@ -141,7 +299,7 @@ async def get_config() -> Dict[str, Any]:
 @router.delete("/clear")
 async def clear_dataset() -> Dict[str, str]:
     """Clear the current dataset."""
-    global current_dataset, current_config
-    current_dataset = None
+    global current_config
+    get_dataset_store().clear()
     current_config = None
     return {"status": "cleared"}
@@ -1,21 +1,153 @@
 """Evolution API Routes"""
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field, fields
+from typing import List, Dict, Any, Literal, Optional
+import os
+import threading
+import time
 import uuid
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+import orjson
+from cachetools import TTLCache
+from starlette.concurrency import run_in_threadpool
 
 from gp.engine import GPEngine
 from gp.checkpoint import get_checkpoint_manager
-from api.websockets.evolution_ws import send_evolution_update
+from api.dataset_store import get_dataset_store
+from api.websockets.evolution_ws import send_evolution_update, get_manager
 
 router = APIRouter()
 
+# Finished sessions are dropped after a day, and the oldest finished ones go
+# first once the cap is reached; pending and running sessions are kept
+MAX_SESSIONS = 1024
+SESSION_TTL = 24 * 3600
+ACTIVE_STATUSES = ("pending", "running")
+
+
+def _uuid7() -> uuid.UUID:
+    """Time-ordered UUID (version 7): 48-bit millisecond timestamp, then random bits."""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | (0x7 << 76)  # version
+    value = value & ~(0x3 << 62) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+def _release_engine(session_id: str):
+    """Stop and forget the engine of a session that is no longer tracked."""
+    engine = running_engines.pop(session_id, None)
+    if engine is not None:
+        engine.stop()
+
+
+class SessionCache(TTLCache):
+    """TTLCache that only evicts finished sessions and stops their engines.
+    
+    Active sessions that reach their TTL are stored again with a fresh one,
+    and size evictions skip them. Only touched from the event loop thread,
+    so no extra locking is needed.
+    """
+    
+    def __contains__(self, key):
+        self.expire()
+        return super().__contains__(key)
+    
+    def __getitem__(self, key):
+        self.expire()
+        return super().__getitem__(key)
+    
+    def popitem(self):
+        """Remove the least recently stored finished session.
+        
+        Raises:
+            KeyError: If every session is still active
+        """
+        self.expire()
+        for key in self:
+            if not super().__getitem__(key).active:
+                value = self.pop(key)
+                _release_engine(key)
+                return key, value
+        raise KeyError("All sessions are active")
+    
+    def expire(self, time=None):
+        expired = super().expire(time)
+        finished = []
+        for key, value in expired:
+            if value.active:
+                self[key] = value
+            else:
+                _release_engine(key)
+                finished.append((key, value))
+        return finished
+
+
+@dataclass
+class SessionState:
+    """State of one evolution session.
+    
+    Written by the background task on every generation update and read by
+    the REST handlers; the lock makes multi-field updates and snapshot reads
+    atomic with respect to each other.
+    """
+    config: Dict[str, Any]
+    status: str = "pending"
+    current_generation: int = 0
+    elapsed_time: float = 0
+    best_fitness: Optional[float] = None
+    best_equation: Optional[str] = None
+    hall_of_fame: List[Dict[str, Any]] = field(default_factory=list)
+    pareto_front: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+    restored_from: Optional[str] = None
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    
+    def update(self, values: Dict[str, Any]):
+        """Set several fields at once."""
+        with self.lock:
+            for name, value in values.items():
+                setattr(self, name, value)
+    
+    @property
+    def active(self) -> bool:
+        """Whether the session is still waiting for or running its evolution."""
+        return self.status in ACTIVE_STATUSES
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Consistent shallow copy of all fields."""
+        with self.lock:
+            return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "lock"}
+
+
 # Store for evolution sessions
-evolution_sessions: Dict[str, Dict[str, Any]] = {}
+evolution_sessions: Dict[str, SessionState] = SessionCache(maxsize=MAX_SESSIONS, ttl=SESSION_TTL)
 # Store for running engines
 running_engines: Dict[str, GPEngine] = {}
+# Event loop each running engine evolves on, keyed by session
+engine_loops: Dict[str, asyncio.AbstractEventLoop] = {}
+
+def _add_session(session_id: str, session: SessionState):
+    """Track a new session; fails with 503 when the cap is taken by active ones."""
+    try:
+        evolution_sessions[session_id] = session
+    except KeyError:
+        raise HTTPException(status_code=503, detail="Too many active evolution sessions")
+
+# Evaluation processes per engine. Up to cpu_count sessions run at once, and
+# a pool of cpu_count processes for each would oversubscribe the machine
+# cpu_count times over, so API engines evaluate in their own thread
+ENGINE_WORKERS = 1
+
+# Evolution is CPU-bound: each run gets a worker thread with its own event
+# loop, so the server loop stays free for requests and WebSocket broadcasts
+_evolution_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 4,
+    thread_name_prefix="evolution"
+)
 
 
 # ============================================
@@ -34,6 +166,10 @@ class EvolutionConfig(BaseModel):
     max_depth: int = 5
     parsimony_coefficient: float = 0.001
     update_interval: float = 0.5  # How often to send updates (seconds)
+    # Precision of the data handed to the engine. float32 halves the bytes
+    # scanned per fitness evaluation; use float64 when the data needs more
+    # than ~7 significant digits.
+    dtype: Literal["float32", "float64"] = "float32"
 
 
 class EvolutionStatus(BaseModel):
@@ -45,23 +181,208 @@ class EvolutionStatus(BaseModel):
     best_equation: Optional[str]
 
 
+class EvolutionResults(BaseModel):
+    session_id: str
+    status: str
+    hall_of_fame: List[Dict[str, Any]]
+    pareto_front: List[Dict[str, Any]]
+    best_equation: Optional[str]
+    best_fitness: Optional[float]
+
+
+# Static /operators payload, serialized once
+_OPERATORS_BODY = orjson.dumps({
+    "operators": [
+        {"id": "add", "symbol": "+", "name": "Addition", "arity": 2},
+        {"id": "sub", "symbol": "-", "name": "Subtraction", "arity": 2},
+        {"id": "mul", "symbol": "*", "name": "Multiplication", "arity": 2},
+        {"id": "div", "symbol": "/", "name": "Protected Division", "arity": 2},
+        {"id": "pow", "symbol": "^", "name": "Power", "arity": 2},
+    ],
+    "functions": [
+        {"id": "sin", "symbol": "sin", "name": "Sine", "arity": 1},
+        {"id": "cos", "symbol": "cos", "name": "Cosine", "arity": 1},
+        {"id": "tan", "symbol": "tan", "name": "Tangent", "arity": 1},
+        {"id": "sqrt", "symbol": "√", "name": "Square Root", "arity": 1},
+        {"id": "log", "symbol": "log", "name": "Natural Logarithm", "arity": 1},
+        {"id": "exp", "symbol": "exp", "name": "Exponential", "arity": 1},
+        {"id": "abs", "symbol": "|x|", "name": "Absolute Value", "arity": 1},
+    ],
+    "terminals": [
+        {"id": "const", "name": "Constants", "description": "Numeric constants (ephemeral)"},
+        {"id": "var", "name": "Variables", "description": "Input variables from dataset"},
+    ]
+})
+
+
 # ============================================
 # Background Evolution Task
 # ============================================
 
+def _stack_columns(
+    arrays: Dict[str, np.ndarray],
+    features: List[str],
+    target: str,
+    dtype: str
+) -> tuple:
+    """Build X and y at the requested dtype, converting each column once."""
+    y = arrays[target].astype(dtype, copy=False)
+    X = np.empty((len(y), len(features)), dtype=dtype)
+    for i, name in enumerate(features):
+        X[:, i] = arrays[name]
+    return X, y
+
+
+def _publish_latest(updates: asyncio.Queue, update: Dict[str, Any]):
+    """Queue an update, replacing any that has not been sent yet (never blocks)."""
+    try:
+        updates.get_nowait()
+    except asyncio.QueueEmpty:
+        pass
+    updates.put_nowait(update)
+
+
+# Candidate lists sent as deltas between updates, with their message key prefix
+# (generation updates carry no pareto_front; it only comes with the final results)
+_DELTA_FIELDS = {"hall_of_fame": "hof"}
+
+
+def _encode_deltas(
+    update: Dict[str, Any],
+    last_sent: Dict[str, Dict[str, Any]],
+    full: bool
+) -> Dict[str, Any]:
+    """
+    Replace candidate lists in an update with the changes since the last send.
+    
+    An unchanged list becomes ``<prefix>_unchanged: True``; otherwise only new
+    candidates are sent (``<prefix>_add``), along with the removed equations
+    (``<prefix>_remove``) and the new order (``<prefix>_order``). Candidates
+    are keyed by their raw expression string.
+    
+    Args:
+        update: Update produced by the engine
+        last_sent: Field -> {equation: candidate} as last sent; updated in place
+        full: Send the complete lists (e.g. a client has just joined)
+        
+    Returns:
+        Update to broadcast
+    """
+    update = dict(update)
+    for field, prefix in _DELTA_FIELDS.items():
+        candidates = update.get(field)
+        if candidates is None:
+            continue
+        
+        current = {c["equation"]: c for c in candidates}
+        previous = last_sent.get(field)
+        last_sent[field] = current
+        if full or previous is None:
+            continue
+        
+        del update[field]
+        if list(current) == list(previous):
+            update[f"{prefix}_unchanged"] = True
+        else:
+            update[f"{prefix}_add"] = [c for eq, c in current.items() if eq not in previous]
+            update[f"{prefix}_remove"] = [eq for eq in previous if eq not in current]
+            update[f"{prefix}_order"] = list(current)
+    return update
+
+
+async def _forward_updates(session_id: str, updates: asyncio.Queue):
+    """Broadcast the latest queued update for a session until cancelled.
+    
+    Deltas are computed here, against what was actually sent, since the queue
+    may drop superseded updates. Newly joined clients get the full lists.
+    """
+    last_sent: Dict[str, Dict[str, Any]] = {}
+    known_connections: set = set()
+    while True:
+        update = await updates.get()
+        connections = set(get_manager().active_connections.get(session_id, ()))
+        full = not connections <= known_connections
+        known_connections = connections
+        await send_evolution_update(session_id, _encode_deltas(update, last_sent, full))
+
+
+async def _run_engine(
+    session_id: str,
+    engine: GPEngine,
+    session: SessionState,
+    updates: asyncio.Queue
+) -> Dict[str, Any]:
+    """
+    Run engine.evolve() on a worker thread with its own event loop.
+    
+    Generation updates are recorded on the session from the worker and
+    handed to this loop's update queue with call_soon_threadsafe.
+    
+    Returns:
+        Final results from the engine
+    """
+    main_loop = asyncio.get_running_loop()
+    
+    async def on_update(update: Dict[str, Any]):
+        session.update({
+            "current_generation": update.get("generation", 0),
+            "elapsed_time": update.get("elapsed_time", 0),
+            "best_fitness": update.get("best", {}).get("fitness"),
+            "best_equation": update.get("best", {}).get("equation"),
+            "hall_of_fame": update.get("hall_of_fame", []),
+        })
+        main_loop.call_soon_threadsafe(_publish_latest, updates, update)
+    
+    async def evolve() -> Dict[str, Any]:
+        engine_loops[session_id] = asyncio.get_running_loop()
+        try:
+            return await engine.evolve(callback=on_update)
+        finally:
+            engine_loops.pop(session_id, None)
+    
+    try:
+        return await main_loop.run_in_executor(_evolution_executor, asyncio.run, evolve())
+    except asyncio.CancelledError:
+        # The worker thread cannot be cancelled; ask the engine to finish
+        engine.stop()
+        raise
+
+
+async def _snapshot_engine(session_id: str, engine: GPEngine) -> Dict[str, Any]:
+    """Take a checkpoint snapshot on the engine's own loop, between generations."""
+    loop = engine_loops.get(session_id)
+    if loop is None:
+        # Not evolving (yet or anymore): nothing mutates the engine
+        return engine.get_checkpoint_state()
+    
+    async def snapshot() -> Dict[str, Any]:
+        return engine.get_checkpoint_state()
+    
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(snapshot(), loop))
+
+
 async def run_evolution(session_id: str, config: EvolutionConfig):
     """Background task to run the evolution algorithm."""
-    from api.routes.data import current_dataset
+    # Held for the whole run: stays valid even if the cache evicts the entry
+    session = evolution_sessions[session_id]
+    store = get_dataset_store()
     
-    if current_dataset is None:
-        evolution_sessions[session_id]["status"] = "error"
-        evolution_sessions[session_id]["error"] = "No dataset loaded"
+    if not store.is_loaded:
+        session.update({"status": "error", "error": "No dataset loaded"})
         return
     
+    # Generation updates are coalesced through a one-slot queue so slow
+    # clients never back-pressure the GP loop; a single task broadcasts.
+    updates: asyncio.Queue = asyncio.Queue(maxsize=1)
+    forwarder = asyncio.create_task(_forward_updates(session_id, updates))
+    
     try:
-        # Prepare data
-        X = current_dataset[config.features].values
-        y = current_dataset[config.target].values
+        # Prepare data (column-projected read from the dataset store)
+        arrays = await run_in_threadpool(
+            store.load_columns, config.features + [config.target]
+        )
+        X, y = _stack_columns(arrays, config.features, config.target, config.dtype)
+        del arrays
         
         # Create GP engine (continuous evolution)
         engine = GPEngine(
@@ -76,30 +397,21 @@ async def run_evolution(session_id: str, config: EvolutionConfig):
             tournament_size=config.tournament_size,
             max_depth=config.max_depth,
             parsimony_coefficient=config.parsimony_coefficient,
-            update_interval=config.update_interval
+            update_interval=config.update_interval,
+            dtype=config.dtype,
+            n_workers=ENGINE_WORKERS
         )
         
         running_engines[session_id] = engine
-        evolution_sessions[session_id]["status"] = "running"
+        session.update({"status": "running"})
         
-        # Callback to send updates via WebSocket
-        async def on_update(update: Dict[str, Any]):
-            await send_evolution_update(session_id, update)
-            
-            # Also update session storage
-            evolution_sessions[session_id].update({
-                "current_generation": update.get("generation", 0),
-                "elapsed_time": update.get("elapsed_time", 0),
-                "best_fitness": update.get("best", {}).get("fitness"),
-                "best_equation": update.get("best", {}).get("equation"),
-                "hall_of_fame": update.get("hall_of_fame", []),
-            })
-        
-        # Run evolution
-        results = await engine.evolve(callback=on_update)
+        # Run evolution (on a worker thread)
+        results = await _run_engine(session_id, engine, session, updates)
+        # Pending generation updates are superseded by the final results
+        forwarder.cancel()
         
         # Update final results
-        evolution_sessions[session_id].update({
+        session.update({
             "status": results["status"],
             "elapsed_time": results.get("elapsed_time", 0),
             "hall_of_fame": results["hall_of_fame"],
@@ -121,13 +433,14 @@ async def run_evolution(session_id: str, config: EvolutionConfig):
         })
         
     except Exception as e:
-        evolution_sessions[session_id]["status"] = "error"
-        evolution_sessions[session_id]["error"] = str(e)
+        forwarder.cancel()
+        session.update({"status": "error", "error": str(e)})
         await send_evolution_update(session_id, {
             "type": "error",
             "message": str(e)
         })
     finally:
+        forwarder.cancel()
         if session_id in running_engines:
             del running_engines[session_id]
 
@@ -139,31 +452,23 @@ async def run_evolution(session_id: str, config: EvolutionConfig):
 @router.post("/start")
 async def start_evolution(config: EvolutionConfig, background_tasks: BackgroundTasks) -> Dict[str, str]:
     """Start a new evolution session."""
-    from api.routes.data import current_dataset
+    store = get_dataset_store()
     
-    if current_dataset is None:
+    if not store.is_loaded:
         raise HTTPException(status_code=400, detail="No dataset loaded")
     
     # Validate columns
-    missing_features = set(config.features) - set(current_dataset.columns)
+    columns = store.column_set
+    missing_features = [c for c in config.features if c not in columns]
     if missing_features:
         raise HTTPException(status_code=400, detail=f"Features not found: {missing_features}")
     
-    if config.target not in current_dataset.columns:
+    if config.target not in columns:
         raise HTTPException(status_code=400, detail=f"Target column not found: {config.target}")
     
-    session_id = str(uuid.uuid4())
-    
-    evolution_sessions[session_id] = {
-        "status": "pending",
-        "config": config.model_dump(),
-        "current_generation": 0,
-        "elapsed_time": 0,
-        "best_fitness": None,
-        "best_equation": None,
-        "hall_of_fame": [],
-        "pareto_front": []
-    }
+    session_id = str(_uuid7())
+    
+    _add_session(session_id, SessionState(config=config.model_dump()))
     
     # Start evolution in background
     background_tasks.add_task(run_evolution, session_id, config)
@@ -171,82 +476,71 @@ async def start_evolution(config: EvolutionConfig, background_tasks: BackgroundT
     return {"session_id": session_id, "status": "created"}
 
 
-@router.get("/status/{session_id}")
-async def get_evolution_status(session_id: str) -> EvolutionStatus:
+# Polled routes return ORJSONResponse directly, skipping response-model
+# validation and jsonable_encoder; the models only document the shape.
+
+@router.get("/status/{session_id}", responses={200: {"model": EvolutionStatus}})
+async def get_evolution_status(session_id: str) -> ORJSONResponse:
     """Get the status of an evolution session."""
-    if session_id not in evolution_sessions:
+    session = evolution_sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = evolution_sessions[session_id]
-    return EvolutionStatus(
-        session_id=session_id,
-        status=session["status"],
-        current_generation=session["current_generation"],
-        elapsed_time=session.get("elapsed_time"),
-        best_fitness=session["best_fitness"],
-        best_equation=session["best_equation"]
-    )
+    snap = session.snapshot()
+    return ORJSONResponse({
+        "session_id": session_id,
+        "status": snap["status"],
+        "current_generation": snap["current_generation"],
+        "elapsed_time": snap["elapsed_time"],
+        "best_fitness": snap["best_fitness"],
+        "best_equation": snap["best_equation"]
+    })
 
 
-@router.get("/results/{session_id}")
-async def get_evolution_results(session_id: str) -> Dict[str, Any]:
+@router.get("/results/{session_id}", responses={200: {"model": EvolutionResults}})
+async def get_evolution_results(session_id: str) -> ORJSONResponse:
     """Get the full results of an evolution session."""
-    if session_id not in evolution_sessions:
+    session = evolution_sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = evolution_sessions[session_id]
-    return {
+    snap = session.snapshot()
+    return ORJSONResponse({
         "session_id": session_id,
-        "status": session["status"],
-        "hall_of_fame": session["hall_of_fame"],
-        "pareto_front": session["pareto_front"],
-        "best_equation": session["best_equation"],
-        "best_fitness": session["best_fitness"]
-    }
+        "status": snap["status"],
+        "hall_of_fame": snap["hall_of_fame"],
+        "pareto_front": snap["pareto_front"],
+        "best_equation": snap["best_equation"],
+        "best_fitness": snap["best_fitness"]
+    })
 
 
 @router.post("/stop/{session_id}")
 async def stop_evolution(session_id: str) -> Dict[str, str]:
     """Stop an evolution session."""
-    if session_id not in evolution_sessions:
+    session = evolution_sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
     # Stop the engine if running
     if session_id in running_engines:
         running_engines[session_id].stop()
     
-    evolution_sessions[session_id]["status"] = "stopped"
+    session.update({"status": "stopped"})
     return {"status": "stopped", "session_id": session_id}
 
 
 @router.get("/operators")
-async def get_available_operators() -> Dict[str, Any]:
+async def get_available_operators() -> Response:
     """Get list of available operators and functions.
     
-    Returns plain dict to avoid Pydantic validation issues.
+    The list is static, so the body is serialized once at import.
     """
-    return {
-        "operators": [
-            {"id": "add", "symbol": "+", "name": "Addition", "arity": 2},
-            {"id": "sub", "symbol": "-", "name": "Subtraction", "arity": 2},
-            {"id": "mul", "symbol": "*", "name": "Multiplication", "arity": 2},
-            {"id": "div", "symbol": "/", "name": "Protected Division", "arity": 2},
-            {"id": "pow", "symbol": "^", "name": "Power", "arity": 2},
-        ],
-        "functions": [
-            {"id": "sin", "symbol": "sin", "name": "Sine", "arity": 1},
-            {"id": "cos", "symbol": "cos", "name": "Cosine", "arity": 1},
-            {"id": "tan", "symbol": "tan", "name": "Tangent", "arity": 1},
-            {"id": "sqrt", "symbol": "√", "name": "Square Root", "arity": 1},
-            {"id": "log", "symbol": "log", "name": "Natural Logarithm", "arity": 1},
-            {"id": "exp", "symbol": "exp", "name": "Exponential", "arity": 1},
-            {"id": "abs", "symbol": "|x|", "name": "Absolute Value", "arity": 1},
-        ],
-        "terminals": [
-            {"id": "const", "name": "Constants", "description": "Numeric constants (ephemeral)"},
-            {"id": "var", "name": "Variables", "description": "Input variables from dataset"},
-        ]
-    }
+    return Response(
+        _OPERATORS_BODY,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=86400"}
+    )
 
 
 # ============================================
@@ -267,15 +561,19 @@ async def save_checkpoint(session_id: str, request: CheckpointRequest = None) ->
     checkpoint_manager = get_checkpoint_manager()
     
     try:
-        state = engine.get_checkpoint_state()
+        # Snapshot on the engine's loop (consistent between generations),
+        # then serialize and write in the threadpool
+        state = await _snapshot_engine(session_id, engine)
         name = request.name if request else None
-        checkpoint_id = checkpoint_manager.save_checkpoint(session_id, state, name)
+        checkpoint_id = await run_in_threadpool(
+            checkpoint_manager.save_checkpoint, session_id, state, name
+        )
         
         return {
             "checkpoint_id": checkpoint_id,
             "session_id": session_id,
             "generation": state.get("generation", 0),
-            "message": "Checkpoint saved successfully"
+            "message": "Checkpoint queued"
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save checkpoint: {str(e)}")
@@ -285,7 +583,7 @@ async def save_checkpoint(session_id: str, request: CheckpointRequest = None) ->
 async def list_checkpoints(session_id: Optional[str] = None) -> Dict[str, Any]:
     """List all available checkpoints."""
     checkpoint_manager = get_checkpoint_manager()
-    checkpoints = checkpoint_manager.list_checkpoints(session_id)
+    checkpoints = await run_in_threadpool(checkpoint_manager.list_checkpoints, session_id)
     
     return {
         "checkpoints": checkpoints,
@@ -297,13 +595,12 @@ async def list_checkpoints(session_id: Optional[str] = None) -> Dict[str, Any]:
 async def get_checkpoint(checkpoint_id: str) -> Dict[str, Any]:
     """Get checkpoint metadata."""
     checkpoint_manager = get_checkpoint_manager()
-    checkpoints = checkpoint_manager.list_checkpoints()
+    cp = await run_in_threadpool(checkpoint_manager.get_metadata, checkpoint_id)
     
-    for cp in checkpoints:
-        if cp.get("checkpoint_id") == checkpoint_id:
-            return cp
+    if cp is None:
+        raise HTTPException(status_code=404, detail="Checkpoint not found")
     
-    raise HTTPException(status_code=404, detail="Checkpoint not found")
+    return cp
 
 
 @router.delete("/checkpoint/{checkpoint_id}")
@@ -311,7 +608,7 @@ async def delete_checkpoint(checkpoint_id: str) -> Dict[str, str]:
     """Delete a checkpoint."""
     checkpoint_manager = get_checkpoint_manager()
     
-    if checkpoint_manager.delete_checkpoint(checkpoint_id):
+    if await run_in_threadpool(checkpoint_manager.delete_checkpoint, checkpoint_id):
         return {"status": "deleted", "checkpoint_id": checkpoint_id}
     
     raise HTTPException(status_code=404, detail="Checkpoint not found")
@@ -323,35 +620,27 @@ async def restore_from_checkpoint(
     background_tasks: BackgroundTasks
 ) -> Dict[str, str]:
     """Restore evolution from a checkpoint and continue running."""
-    from api.routes.data import current_dataset
-    
     checkpoint_manager = get_checkpoint_manager()
     
     try:
-        state = checkpoint_manager.load_checkpoint(checkpoint_id)
+        state = await run_in_threadpool(checkpoint_manager.load_checkpoint, checkpoint_id)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Checkpoint not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load checkpoint: {str(e)}")
     
-    if current_dataset is None:
+    if not get_dataset_store().is_loaded:
         raise HTTPException(status_code=400, detail="No dataset loaded. Please load the original dataset first.")
     
     # Create new session for restored evolution
-    session_id = str(uuid.uuid4())
+    session_id = str(_uuid7())
     config = state.get("config", {})
     
-    evolution_sessions[session_id] = {
-        "status": "pending",
-        "config": config,
-        "current_generation": state.get("generation", 0),
-        "elapsed_time": 0,
-        "best_fitness": None,
-        "best_equation": None,
-        "hall_of_fame": [],
-        "pareto_front": [],
-        "restored_from": checkpoint_id
-    }
+    _add_session(session_id, SessionState(
+        config=config,
+        current_generation=state.get("generation", 0),
+        restored_from=checkpoint_id
+    ))
     
     # Start restored evolution in background
     background_tasks.add_task(
@@ -375,20 +664,24 @@ async def run_restored_evolution(
     config: Dict[str, Any]
 ):
     """Background task to run evolution from a restored checkpoint."""
-    from api.routes.data import current_dataset
+    # Held for the whole run: stays valid even if the cache evicts the entry
+    session = evolution_sessions[session_id]
+    store = get_dataset_store()
     
-    if current_dataset is None:
-        evolution_sessions[session_id]["status"] = "error"
-        evolution_sessions[session_id]["error"] = "No dataset loaded"
+    if not store.is_loaded:
+        session.update({"status": "error", "error": "No dataset loaded"})
         return
     
+    updates: asyncio.Queue = asyncio.Queue(maxsize=1)
+    forwarder = asyncio.create_task(_forward_updates(session_id, updates))
+    
     try:
         # Get feature/target from config
         features = config.get("variable_names", [])
         target_col = None
         
         # Try to find target column (not in features)
-        for col in current_dataset.columns:
+        for col in store.columns:
             if col not in features:
                 target_col = col
                 break
@@ -396,8 +689,10 @@ async def run_restored_evolution(
         if not features or not target_col:
             raise ValueError("Could not determine features and target from checkpoint")
         
-        X = current_dataset[features].values
-        y = current_dataset[target_col].values
+        arrays = await run_in_threadpool(store.load_columns, features + [target_col])
+        dtype = config.get("dtype", "float32")
+        X, y = _stack_columns(arrays, features, target_col, dtype)
+        del arrays
         
         # Create engine with checkpoint config
         engine = GPEngine(
@@ -412,30 +707,22 @@ async def run_restored_evolution(
             tournament_size=config.get("tournament_size", 7),
             max_depth=config.get("max_depth", 5),
             parsimony_coefficient=config.get("parsimony_coefficient", 0.001),
+            dtype=dtype,
+            n_workers=ENGINE_WORKERS,
         )
         
         # Restore state
         engine.restore_from_checkpoint(checkpoint_state)
         
         running_engines[session_id] = engine
-        evolution_sessions[session_id]["status"] = "running"
-        
-        # Callback for updates
-        async def on_update(update: Dict[str, Any]):
-            await send_evolution_update(session_id, update)
-            evolution_sessions[session_id].update({
-                "current_generation": update.get("generation", 0),
-                "elapsed_time": update.get("elapsed_time", 0),
-                "best_fitness": update.get("best", {}).get("fitness"),
-                "best_equation": update.get("best", {}).get("equation"),
-                "hall_of_fame": update.get("hall_of_fame", []),
-            })
+        session.update({"status": "running"})
         
-        # Run evolution
-        results = await engine.evolve(callback=on_update)
+        # Run evolution (on a worker thread)
+        results = await _run_engine(session_id, engine, session, updates)
+        forwarder.cancel()
         
         # Update final results
-        evolution_sessions[session_id].update({
+        session.update({
             "status": results["status"],
             "elapsed_time": results.get("elapsed_time", 0),
             "hall_of_fame": results["hall_of_fame"],
@@ -452,12 +739,13 @@ async def run_restored_evolution(
         })
         
     except Exception as e:
-        evolution_sessions[session_id]["status"] = "error"
-        evolution_sessions[session_id]["error"] = str(e)
+        forwarder.cancel()
+        session.update({"status": "error", "error": str(e)})
         await send_evolution_update(session_id, {
             "type": "error",
             "message": str(e)
         })
     finally:
+        forwarder.cancel()
         if session_id in running_engines:
             del running_engines[session_id]
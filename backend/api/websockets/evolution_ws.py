@@ -4,11 +4,17 @@ from typing import Dict, Set
 import json
 import asyncio
 import logging
+import orjson
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+def _encode(message: dict) -> str:
+    """Serialize a message once with orjson (numpy-aware, NaN/Inf -> null)."""
+    return orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
 class ConnectionManager:
     """Manages WebSocket connections for evolution sessions."""
     
@@ -34,7 +40,7 @@ class ConnectionManager:
     async def send_personal(self, websocket: WebSocket, message: dict):
         """Send a message to a specific WebSocket."""
         try:
-            await websocket.send_json(message)
+            await websocket.send_text(_encode(message))
         except Exception as e:
             logger.error(f"Error sending to WebSocket: {e}")
     
@@ -43,17 +49,24 @@ class ConnectionManager:
         if session_id not in self.active_connections:
             return
         
+        # Encode once for every subscriber, then send to all connections
+        # concurrently: latency is the slowest client rather than the sum
+        payload = _encode(message)
+        connections = list(self.active_connections[session_id])
+        results = await asyncio.gather(
+            *(connection.send_text(payload) for connection in connections),
+            return_exceptions=True
+        )
+        
         dead_connections = set()
-        for connection in self.active_connections[session_id]:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.warning(f"Failed to send to connection: {e}")
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to send to connection: {result}")
                 dead_connections.add(connection)
         
         # Clean up dead connections
         for conn in dead_connections:
-            self.active_connections[session_id].discard(conn)
+            self.active_connections.get(session_id, set()).discard(conn)
     
     def has_connections(self, session_id: str) -> bool:
         """Check if there are active connections for a session."""
@@ -1,17 +1,436 @@
 """Checkpoint system for saving and restoring evolution state."""
 import os
-import json
+import atexit
+import hashlib
+import io
+import mmap
 import pickle
+import queue
+import shutil
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import BinaryIO, Callable, Dict, Any, List, Optional, Tuple
 import logging
 
+import lz4.frame as lz4_frame
+import orjson
+import zstandard
+from cachetools import LRUCache
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
 # Default checkpoint directory
 CHECKPOINT_DIR = Path(__file__).parent.parent / "checkpoints"
 
+# Checkpoint file layout:
+#   header   magic, format version, codec, buffer count, main length
+#   main     pickle stream (protocol 5), compressed with the codec; for
+#            zstd-delta, the 16-byte digest of the delta base comes first
+#   buffers  raw out-of-band buffers (numpy data), stored uncompressed, each
+#            starting on a 64-byte boundary so it can be mapped in place
+#   index    (offset, length) per out-of-band buffer
+CHECKPOINT_MAGIC = b"EKCP"
+CHECKPOINT_FORMAT = 2
+CODEC_NONE = 0
+CODEC_LZ4 = 1
+CODEC_ZSTD = 2
+CODEC_ZSTD_DELTA = 3
+CODEC_NAMES = {
+    CODEC_NONE: "none",
+    CODEC_LZ4: "lz4",
+    CODEC_ZSTD: "zstd",
+    CODEC_ZSTD_DELTA: "zstd-delta",
+}
+# Codec of new checkpoints; the others remain readable
+DEFAULT_CODEC = CODEC_ZSTD_DELTA
+ZSTD_LEVEL = 3
+_HEADER = struct.Struct("<4sBBIQ")
+_INDEX_ENTRY = struct.Struct("<QQ")
+_BUFFER_ALIGN = 64
+# Append-only metadata index (JSON lines: metadata records, {"delete": id}
+# tombstones), compacted when mostly dead records
+INDEX_NAME = "index.jsonl"
+INDEX_LOCK_NAME = ".index.lock"
+INDEX_COMPACT_RATIO = 10
+INDEX_COMPACT_MIN_LINES = 64
+# Buffers per writev() call (stays under the usual IOV_MAX of 1024)
+WRITEV_MAX_CHUNKS = 1024
+# Checkpoints queued for the writer thread before save_checkpoint blocks
+WRITE_QUEUE_SIZE = 2
+# Ids of failed background writes remembered so loading them reports why
+FAILED_WRITES_KEPT = 256
+# Directory holding deleted checkpoints until the writer thread unlinks them
+TRASH_NAME = ".trash"
+# Delta bases: full pickle streams, named by digest, that zstd-delta
+# checkpoints are compressed against (as a raw-content dictionary). Deltas
+# always reference a base, never another checkpoint, so deleting checkpoints
+# cannot break a chain.
+DELTA_BASE_DIR = ".bases"
+# Checkpoints compressed against one base before a session starts a new one
+DELTA_REBASE_INTERVAL = 16
+# Sessions whose current base is kept in memory
+DELTA_BASE_SESSIONS = 32
+# Unreferenced bases younger than this are kept (another process may be
+# about to index a checkpoint using it)
+DELTA_BASE_GRACE = 60
+# Concurrent deletions in cleanup_old_checkpoints
+CLEANUP_WORKERS = 8
+# State file extensions: current format, then legacy plain pickle
+STATE_SUFFIXES = (".ckpt", ".pkl")
+# Pickler emits many small frames; coalesce them into 1 MiB write() calls
+IO_BUFFER_SIZE = 1 << 20
+# Globals a checkpoint may reference; loading anything else is refused, so a
+# tampered checkpoint file cannot call arbitrary functions
+SAFE_GLOBALS = frozenset(
+    [("builtins", name) for name in (
+        "object", "bool", "int", "float", "complex", "str", "repr", "bytes",
+        "bytearray", "list", "tuple", "dict", "set", "frozenset",
+    )]
+    + [
+        ("_operator", "eq"),
+        ("copyreg", "_reconstructor"),
+        ("deap.base", "Fitness"),
+        ("deap.creator", "meta_create"),
+        ("deap.gp", "MetaEphemeral"),
+        ("deap.gp", "Primitive"),
+        ("deap.gp", "PrimitiveTree"),
+        ("deap.gp", "Terminal"),
+        ("deap.tools.support", "HallOfFame"),
+        ("deap.tools.support", "ParetoFront"),
+        ("numpy", "dtype"),
+        ("numpy", "ndarray"),
+        ("numpy.core.multiarray", "_reconstruct"),
+        ("numpy.core.multiarray", "scalar"),
+        ("numpy.core.numeric", "_frombuffer"),
+        ("numpy._core.multiarray", "_reconstruct"),
+        ("numpy._core.multiarray", "scalar"),
+        ("numpy._core.numeric", "_frombuffer"),
+    ]
+)
+# Modules whose functions may be referenced (ephemeral constant generators)
+SAFE_MODULES = frozenset({"gp.primitives"})
+# Config fields copied into checkpoint metadata for listing/filtering; the
+# full config lives only in the state file
+METADATA_CONFIG_FIELDS = ("population_size", "max_depth", "dtype")
+
+
+def _dump_metadata(metadata: Dict[str, Any]) -> bytes:
+    """Encode checkpoint metadata as indented JSON."""
+    return orjson.dumps(metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _config_hash(config: Dict[str, Any]) -> str:
+    """Short content hash of an engine config (key order does not matter)."""
+    encoded = orjson.dumps(config, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+
+def _created_ns(metadata: Dict[str, Any]) -> int:
+    """Creation time in ns for metadata written before created_ns was recorded."""
+    try:
+        return int(datetime.fromisoformat(metadata["created_at"]).timestamp() * 1e9)
+    except (KeyError, TypeError, ValueError):
+        return 0
+
+
+def _load_metadata(path: Path) -> Dict[str, Any]:
+    """Read a checkpoint metadata file."""
+    return orjson.loads(path.read_bytes())
+
+
+class _HashingWriter:
+    """File-like wrapper that feeds everything written through a hash."""
+    
+    def __init__(self, stream: BinaryIO, digest):
+        self.stream = stream
+        self.digest = digest
+    
+    def write(self, data) -> int:
+        self.digest.update(data)
+        return self.stream.write(data)
+
+
+def _dump_index_record(record: Dict[str, Any]) -> bytes:
+    """Encode one checkpoint index line."""
+    return orjson.dumps(record, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+
+
+def _load_index_record(line: bytes) -> Dict[str, Any]:
+    """Decode one checkpoint index line."""
+    return orjson.loads(line)
+
+
+def _write_atomically(
+    path: Path,
+    write: Callable[[BinaryIO], Optional[int]],
+    buffering: int = -1,
+    keep: Optional[Callable[[], bool]] = None,
+    drop_cache: bool = False
+) -> Optional[int]:
+    """
+    Write a file beside its final path, fsync it, then rename it into place.
+    
+    Readers see either the previous file or the complete new one, never a
+    partial write; a crash leaves only a stray .tmp file.
+    
+    Args:
+        path: Final file path
+        write: Writes the content to the open temporary file and returns
+            the number of bytes written (None to take the file position)
+        buffering: Buffer size for the temporary file
+        keep: Called after writing; if it returns False the file is discarded
+        drop_cache: Evict the written pages from the page cache after fsync
+            (for files that are only read back after a failure)
+        
+    Returns:
+        Size of the written file in bytes, or None if it was discarded
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, 'wb', buffering=buffering) as f:
+            size = write(f)
+            if keep is not None and not keep():
+                tmp_path.unlink()
+                return None
+            f.flush()
+            os.fsync(f.fileno())
+            if drop_cache and hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+            if size is None:
+                size = f.tell()
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return size
+
+
+def _link_file(source: Path, target: Path):
+    """Give an existing file a second name (a copy where hard links are unsupported)."""
+    try:
+        os.link(source, target)
+    except OSError:
+        with open(source, 'rb') as src:
+            _write_atomically(target, lambda f: shutil.copyfileobj(src, f))
+
+
+def _write_gathered(f: BinaryIO, chunks: List[Any]):
+    """
+    Write a sequence of buffers with as few syscalls as possible.
+    
+    Uses os.writev on the underlying descriptor where available, so large
+    buffers go to the kernel straight from their own memory.
+    
+    Args:
+        f: Buffered binary file; its buffer is flushed first
+        chunks: bytes-like objects, written in order
+    """
+    views = [memoryview(chunk).cast("B") for chunk in chunks if len(chunk)]
+    if not hasattr(os, "writev"):
+        for view in views:
+            f.write(view)
+        return
+    
+    f.flush()
+    fd = f.fileno()
+    first = 0
+    while first < len(views):
+        written = os.writev(fd, views[first:first + WRITEV_MAX_CHUNKS])
+        # Advance past fully written buffers; resume a partial one
+        while first < len(views) and written >= views[first].nbytes:
+            written -= views[first].nbytes
+            first += 1
+        if written:
+            views[first] = views[first][written:]
+    
+    # Resync the buffered file's position with the descriptor
+    f.seek(0, os.SEEK_END)
+
+
+class _DeltaBase:
+    """A pickle stream used as the zstd dictionary for delta checkpoints."""
+    
+    def __init__(self, data: bytes):
+        self.digest = hashlib.blake2b(data, digest_size=16).digest()
+        self.dict = zstandard.ZstdCompressionDict(data, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+        self.uses = 0
+
+
+def _delta_base_path(checkpoint_dir: Path, digest: bytes) -> Path:
+    """Get path of the delta base file with this digest."""
+    return checkpoint_dir / DELTA_BASE_DIR / f"{digest.hex()}.zst"
+
+
+def _read_delta_base(checkpoint_dir: Path, digest: bytes) -> _DeltaBase:
+    """Load a delta base written by CheckpointManager._commit_delta_base."""
+    path = _delta_base_path(checkpoint_dir, digest)
+    with open(path, 'rb') as f:
+        data = zstandard.ZstdDecompressor().decompress(f.read())
+    return _DeltaBase(data)
+
+
+def _write_state(
+    f: BinaryIO,
+    state: Dict[str, Any],
+    codec: int = CODEC_ZSTD,
+    digest=None,
+    base_for: Optional[Callable[[bytes], _DeltaBase]] = None
+) -> int:
+    """
+    Stream state into a file in the checkpoint layout.
+    
+    The pickle stream is written straight through the compressor, and numpy
+    buffers straight from their memory, so no serialized copy of the state is
+    held in memory. The zstd-delta codec is the exception: the pickle stream
+    is built in memory, since it may become the next delta base.
+    
+    Args:
+        f: File opened for binary writing (must be seekable)
+        state: State dictionary to serialize
+        codec: Compression for the pickle stream (CODEC_*)
+        digest: Optional hashlib object updated with the uncompressed content
+        base_for: For CODEC_ZSTD_DELTA, called with the pickle stream and
+            returns the base to compress it against
+        
+    Returns:
+        Size of the written checkpoint in bytes
+        
+    Raises:
+        ValueError: CODEC_ZSTD_DELTA without base_for
+    """
+    if codec == CODEC_ZSTD_DELTA and base_for is None:
+        raise ValueError("The zstd-delta codec needs base_for")
+    
+    # Counts are patched into the header once known
+    f.write(_HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_FORMAT, CODEC_NONE, 0, 0))
+    
+    buffers: List[pickle.PickleBuffer] = []
+    
+    def dump(stream):
+        if digest is not None:
+            stream = _HashingWriter(stream, digest)
+        pickle.Pickler(stream, protocol=5, buffer_callback=buffers.append).dump(state)
+    
+    if codec == CODEC_ZSTD_DELTA:
+        raw = io.BytesIO()
+        dump(raw)
+        data = raw.getvalue()
+        base = base_for(data)
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=base.dict)
+        f.write(base.digest)
+        f.write(compressor.compress(data))
+        del raw, data
+    elif codec == CODEC_ZSTD:
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+        with compressor.stream_writer(f, closefd=False) as stream:
+            dump(stream)
+    elif codec == CODEC_LZ4:
+        with lz4_frame.LZ4FrameFile(f, mode="wb") as stream:
+            dump(stream)
+    else:
+        dump(f)
+    position = f.tell()
+    main_len = position - _HEADER.size
+    
+    # Buffers (with alignment padding) and the index go out in one gathered write
+    chunks = []
+    index = []
+    for buf in buffers:
+        padding = -position % _BUFFER_ALIGN
+        chunks.append(b"\0" * padding)
+        position += padding
+        
+        raw = buf.raw()
+        index.append((position, raw.nbytes))
+        chunks.append(raw)
+        position += raw.nbytes
+        if digest is not None:
+            digest.update(raw)
+    chunks.append(b"".join(_INDEX_ENTRY.pack(offset, length) for offset, length in index))
+    _write_gathered(f, chunks)
+    
+    f.seek(0)
+    f.write(_HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_FORMAT, codec, len(index), main_len))
+    return position + len(index) * _INDEX_ENTRY.size
+
+
+class _StateUnpickler(pickle.Unpickler):
+    """Unpickler restricted to the globals checkpoint state is made of."""
+    
+    def find_class(self, module: str, name: str):
+        if (module, name) in SAFE_GLOBALS or module in SAFE_MODULES:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"Checkpoint references disallowed global {module}.{name}")
+
+
+def _unpickle(stream: BinaryIO, buffers=None) -> Any:
+    """Unpickle checkpoint state from a stream, allowing only SAFE_GLOBALS."""
+    return _StateUnpickler(stream, buffers=buffers).load()
+
+
+def _read_state(path: Path) -> Dict[str, Any]:
+    """
+    Load a checkpoint file written by _write_state.
+    
+    The file is memory-mapped; numpy arrays in the state are read-only views
+    over the mapping rather than copies. Without such arrays the mapping is
+    released as soon as the state is loaded.
+    """
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    magic, version, codec, n_buffers, main_len = _HEADER.unpack_from(mm)
+    if magic != CHECKPOINT_MAGIC or version != CHECKPOINT_FORMAT:
+        raise ValueError("Unrecognized checkpoint format")
+    
+    # The main section is read once, front to back: ask for readahead
+    if hasattr(mm, "madvise"):
+        mm.madvise(mmap.MADV_SEQUENTIAL, 0, _HEADER.size + main_len)
+    
+    view = memoryview(mm)
+    index_start = len(mm) - n_buffers * _INDEX_ENTRY.size
+    buffers = [
+        view[offset:offset + length]
+        for offset, length in _INDEX_ENTRY.iter_unpack(mm[index_start:])
+    ]
+    
+    main = view[_HEADER.size:_HEADER.size + main_len]
+    if codec in (CODEC_ZSTD, CODEC_ZSTD_DELTA):
+        decompressor = zstandard.ZstdDecompressor()
+        if codec == CODEC_ZSTD_DELTA:
+            base = _read_delta_base(path.parent, bytes(main[:16]))
+            decompressor = zstandard.ZstdDecompressor(dict_data=base.dict)
+            main = main[16:]
+        with decompressor.stream_reader(main) as stream:
+            state = _unpickle(stream, buffers)
+        del stream
+    elif codec == CODEC_LZ4:
+        state = _unpickle(io.BytesIO(lz4_frame.decompress(main)), buffers)
+    elif codec == CODEC_NONE:
+        # The mapping is itself a file object; the pickle ends at its STOP opcode
+        mm.seek(_HEADER.size)
+        state = _unpickle(mm, buffers)
+    else:
+        raise ValueError(f"Unknown checkpoint codec: {codec}")
+    
+    if not buffers:
+        # Nothing in the state refers to the mapping
+        main.release()
+        view.release()
+        mm.close()
+    return state
+
 
 class CheckpointManager:
     """Manages saving and loading evolution checkpoints."""
@@ -19,12 +438,65 @@ class CheckpointManager:
     def __init__(self, checkpoint_dir: Optional[Path] = None):
         self.checkpoint_dir = checkpoint_dir or CHECKPOINT_DIR
         self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        # Deleted checkpoints are renamed here and unlinked in the background
+        self.trash_dir = self.checkpoint_dir / TRASH_NAME
+        self.trash_dir.mkdir(exist_ok=True)
+        (self.checkpoint_dir / DELTA_BASE_DIR).mkdir(exist_ok=True)
+        # Current delta base per session (used by the writer thread only)
+        self._delta_bases: LRUCache = LRUCache(maxsize=DELTA_BASE_SESSIONS)
+        # Content digest and id of the last checkpoint written per session
+        self._last_hash: Dict[str, Tuple[bytes, str]] = {}
+        
+        # Append-only index of metadata records and delete tombstones,
+        # replayed incrementally into memory
+        self._index_path = self.checkpoint_dir / INDEX_NAME
+        self._lock_path = self.checkpoint_dir / INDEX_LOCK_NAME
+        self._index: Dict[str, Dict[str, Any]] = {}
+        # Same records grouped by session, so per-session listing is O(N_session)
+        self._sessions: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._index_pos = 0
+        self._index_lines = 0
+        self._index_inode: Optional[int] = None
+        # Lock order: _index_lock, then _file_lock
+        self._index_lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        
+        # Checkpoint writes and trash purges run on a single background
+        # thread; the bounded queue applies backpressure to callers saving
+        # faster than the disk
+        self._writes: queue.Queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        # Queued checkpoints not written yet, each set once its write is
+        # done, so reads of one checkpoint wait for that write alone; and the
+        # error of each the writer failed to save (both under _pending_lock)
+        self._pending: Dict[str, threading.Event] = {}
+        self._failed: LRUCache = LRUCache(maxsize=FAILED_WRITES_KEPT)
+        self._pending_lock = threading.Lock()
+        self._purge_lock = threading.Lock()
+        self._purge_pending = False
+        self._writer = threading.Thread(
+            target=self._drain_writes, name="checkpoint-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.flush)
+        # Anything left in the trash by a previous process
+        self._schedule_purge()
         logger.info(f"CheckpointManager initialized with dir: {self.checkpoint_dir}")
     
     def _get_checkpoint_path(self, checkpoint_id: str) -> Path:
         """Get full path for a checkpoint."""
+        return self.checkpoint_dir / f"{checkpoint_id}.ckpt"
+    
+    def _get_legacy_path(self, checkpoint_id: str) -> Path:
+        """Get path of a checkpoint written in the old plain-pickle format."""
         return self.checkpoint_dir / f"{checkpoint_id}.pkl"
     
+    def _find_checkpoint_file(self, checkpoint_id: str) -> Optional[Path]:
+        """Get the existing state file for a checkpoint, if any."""
+        for path in (self._get_checkpoint_path(checkpoint_id), self._get_legacy_path(checkpoint_id)):
+            if path.exists():
+                return path
+        return None
+    
     def _get_metadata_path(self, checkpoint_id: str) -> Path:
         """Get path for checkpoint metadata."""
         return self.checkpoint_dir / f"{checkpoint_id}.json"
@@ -33,49 +505,232 @@ class CheckpointManager:
         self,
         session_id: str,
         state: Dict[str, Any],
-        name: Optional[str] = None
+        name: Optional[str] = None,
+        compress: bool = True
     ) -> str:
         """
-        Save a checkpoint to disk.
+        Queue a checkpoint to be written to disk.
+        
+        Returns as soon as the checkpoint is queued; serialization, compression
+        and I/O happen on the writer thread. Loading, reading the metadata of
+        or deleting the returned id waits for its write; list_checkpoints()
+        shows it once written, and flush() waits for every queued write. If
+        the write fails, load_checkpoint() raises with the writer's error.
         
         Args:
             session_id: Evolution session ID
-            state: State dictionary from GPEngine.get_checkpoint_state()
+            state: State snapshot from GPEngine.get_checkpoint_state(); must
+                not be mutated afterwards
             name: Optional human-readable name for checkpoint
+            compress: Compress the pickle stream (zstd against a delta base)
             
         Returns:
             checkpoint_id: Unique identifier for this checkpoint
         """
-        timestamp = datetime.now()
-        checkpoint_id = f"{session_id}_{timestamp.strftime('%Y%m%d_%H%M%S')}"
+        # One clock read; the nanosecond suffix keeps ids taken within the
+        # same second distinct
+        created_ns = time.time_ns()
+        timestamp = datetime.fromtimestamp(created_ns / 1e9)
+        checkpoint_id = f"{session_id}_{timestamp:%Y%m%d_%H%M%S}_{created_ns % 1_000_000_000:09d}"
         
-        # Save binary state with pickle
+        with self._pending_lock:
+            self._pending[checkpoint_id] = threading.Event()
+        self._writes.put(partial(
+            self._write_queued, checkpoint_id, session_id, state, name, compress,
+            timestamp, created_ns
+        ))
+        return checkpoint_id
+    
+    def flush(self):
+        """Wait until all queued checkpoints have been written."""
+        self._writes.join()
+    
+    def _drain_writes(self):
+        """Writer thread: run queued jobs one at a time."""
+        while True:
+            job = self._writes.get()
+            try:
+                job()
+            except Exception as e:
+                logger.error(f"Background checkpoint job failed: {e}")
+            finally:
+                self._writes.task_done()
+    
+    def _wait_for(self, checkpoint_id: str):
+        """Wait until a queued checkpoint has been written (no-op if not queued)."""
+        with self._pending_lock:
+            event = self._pending.get(checkpoint_id)
+        if event is not None:
+            event.wait()
+    
+    def _write_queued(self, checkpoint_id: str, *args):
+        """Writer job for save_checkpoint: remember the error if the write fails."""
+        error = None
+        try:
+            self._write_checkpoint(checkpoint_id, *args)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            with self._pending_lock:
+                if error is not None:
+                    self._failed[checkpoint_id] = str(error)
+                self._pending.pop(checkpoint_id).set()
+    
+    def _schedule_purge(self):
+        """Queue a trash purge unless one is already pending."""
+        with self._purge_lock:
+            if self._purge_pending:
+                return
+            self._purge_pending = True
+        self._writes.put(self._purge_trash)
+    
+    def _purge_trash(self):
+        """Unlink everything in the trash directory."""
+        with self._purge_lock:
+            self._purge_pending = False
+        with os.scandir(self.trash_dir) as entries:
+            for entry in entries:
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+        self._collect_delta_bases()
+    
+    def _collect_delta_bases(self):
+        """Unlink delta bases that no live checkpoint is compressed against."""
+        with self._index_lock:
+            self._refresh_index()
+            referenced = {record.get("delta_base") for record in self._index.values()}
+        referenced.update(base.digest.hex() for base in self._delta_bases.values())
+        
+        cutoff = time.time() - DELTA_BASE_GRACE
+        with os.scandir(self.checkpoint_dir / DELTA_BASE_DIR) as entries:
+            for entry in entries:
+                stem, ext = os.path.splitext(entry.name)
+                if ext != ".zst" or stem in referenced:
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+    
+    def _delta_base_for(self, session_id: str, data: bytes) -> _DeltaBase:
+        """
+        Get the base to compress a session's next checkpoint against.
+        
+        The session keeps its base for DELTA_REBASE_INTERVAL checkpoints; the
+        first checkpoint after that (or of a new session) becomes the new base.
+        
+        Nothing is recorded until the checkpoint is kept; see
+        _commit_delta_base.
+        
+        Args:
+            session_id: Session the checkpoint belongs to
+            data: Uncompressed pickle stream of the checkpoint
+        """
+        base = self._delta_bases.get(session_id)
+        if base is None or base.uses >= DELTA_REBASE_INTERVAL:
+            base = _DeltaBase(data)
+        return base
+    
+    def _commit_delta_base(self, session_id: str, base: _DeltaBase):
+        """Count a kept checkpoint against its base, storing the base first if it is new."""
+        if self._delta_bases.get(session_id) is not base:
+            path = _delta_base_path(self.checkpoint_dir, base.digest)
+            if not path.exists():
+                compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+                _write_atomically(path, lambda f: f.write(compressor.compress(base.dict.as_bytes())))
+            self._delta_bases[session_id] = base
+        base.uses += 1
+    
+    def _write_checkpoint(
+        self,
+        checkpoint_id: str,
+        session_id: str,
+        state: Dict[str, Any],
+        name: Optional[str],
+        compress: bool,
+        timestamp: datetime,
+        created_ns: int
+    ):
+        """Write a checkpoint's state file, metadata and index record."""
+        # Save binary state (pickle protocol 5, compressed, out-of-band buffers)
         checkpoint_path = self._get_checkpoint_path(checkpoint_id)
+        codec = DEFAULT_CODEC if compress else CODEC_NONE
+        digest = hashlib.blake2b(digest_size=16)
+        last = self._last_hash.get(session_id)
+        bases: List[_DeltaBase] = []
+        
+        def base_for(data: bytes) -> _DeltaBase:
+            bases.append(self._delta_base_for(session_id, data))
+            return bases[-1]
+        
+        def keep() -> bool:
+            # Identical content to the session's last checkpoint (still on
+            # disk): drop the new file before fsync/rename/metadata
+            if (last is not None
+                    and last[0] == digest.digest()
+                    and self._find_checkpoint_file(last[1]) is not None):
+                return False
+            # The base must be on disk before the checkpoint that needs it
+            for base in bases:
+                self._commit_delta_base(session_id, base)
+            return True
+        
         try:
-            with open(checkpoint_path, 'wb') as f:
-                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            file_size = _write_atomically(
+                checkpoint_path,
+                lambda f: _write_state(f, state, codec, digest, base_for),
+                buffering=IO_BUFFER_SIZE,
+                keep=keep,
+                drop_cache=True
+            )
         except Exception as e:
             logger.error(f"Failed to save checkpoint state: {e}")
             raise
         
+        if file_size is None:
+            # Same content: the new checkpoint shares the last one's state
+            # file and gets its own metadata (name, timestamp, index record)
+            logger.info(f"State unchanged since checkpoint {last[1]}, sharing its file")
+            previous = _load_metadata(self._get_metadata_path(last[1]))
+            _link_file(self._get_checkpoint_path(last[1]), checkpoint_path)
+            file_size = previous["file_size_bytes"]
+            compression = previous["compression"]
+            delta_base = previous.get("delta_base")
+        else:
+            compression = CODEC_NAMES[codec]
+            delta_base = bases[0].digest.hex() if bases else None
+        self._last_hash[session_id] = (digest.digest(), checkpoint_id)
+        
         # Save metadata as JSON
+        config = state.get("config", {})
         metadata = {
             "checkpoint_id": checkpoint_id,
             "session_id": session_id,
             "name": name or f"Checkpoint at generation {state.get('generation', 0)}",
             "created_at": timestamp.isoformat(),
+            "created_ns": created_ns,
             "generation": state.get("generation", 0),
-            "config": state.get("config", {}),
+            "config": {
+                field: config[field] for field in METADATA_CONFIG_FIELDS if field in config
+            },
+            "config_hash": _config_hash(config),
             "data_info": state.get("data_info", {}),
-            "file_size_bytes": os.path.getsize(checkpoint_path),
+            "file_size_bytes": file_size,
+            "compression": compression,
         }
+        if delta_base is not None:
+            metadata["delta_base"] = delta_base
         
+        # Written last: its presence is what marks the checkpoint as complete
         metadata_path = self._get_metadata_path(checkpoint_id)
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        _write_atomically(metadata_path, lambda f: f.write(_dump_metadata(metadata)))
+        self._append_index(metadata)
         
         logger.info(f"Saved checkpoint {checkpoint_id} at generation {state.get('generation', 0)}")
-        return checkpoint_id
     
     def load_checkpoint(self, checkpoint_id: str) -> Dict[str, Any]:
         """
@@ -87,14 +742,24 @@ class CheckpointManager:
         Returns:
             state: State dictionary to pass to GPEngine.restore_from_checkpoint()
         """
-        checkpoint_path = self._get_checkpoint_path(checkpoint_id)
+        self._wait_for(checkpoint_id)
+        checkpoint_path = self._find_checkpoint_file(checkpoint_id)
         
-        if not checkpoint_path.exists():
+        if checkpoint_path is None:
+            with self._pending_lock:
+                error = self._failed.get(checkpoint_id)
+            if error is not None:
+                raise RuntimeError(f"Checkpoint {checkpoint_id} failed to save: {error}")
             raise FileNotFoundError(f"Checkpoint not found: {checkpoint_id}")
         
         try:
-            with open(checkpoint_path, 'rb') as f:
-                state = pickle.load(f)
+            if checkpoint_path.suffix == ".pkl":
+                with open(checkpoint_path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+                    if hasattr(os, "posix_fadvise"):
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    state = _unpickle(f)
+            else:
+                state = _read_state(checkpoint_path)
         except Exception as e:
             logger.error(f"Failed to load checkpoint: {e}")
             raise
@@ -102,38 +767,50 @@ class CheckpointManager:
         logger.info(f"Loaded checkpoint {checkpoint_id}")
         return state
     
+    def get_metadata(self, checkpoint_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get metadata for a single checkpoint.
+        
+        Reads the checkpoint's own metadata file directly, without scanning
+        the directory.
+        
+        Args:
+            checkpoint_id: Unique identifier for the checkpoint
+            
+        Returns:
+            Metadata dictionary, or None if the checkpoint does not exist
+        """
+        self._wait_for(checkpoint_id)
+        if self._find_checkpoint_file(checkpoint_id) is None:
+            return None
+        
+        try:
+            return _load_metadata(self._get_metadata_path(checkpoint_id))
+        except FileNotFoundError:
+            return None
+    
     def list_checkpoints(self, session_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         List all available checkpoints.
         
+        Reads the index without waiting for queued writes, so checkpoints
+        still being written are not listed yet.
+        
         Args:
             session_id: Optional filter by session ID
             
         Returns:
             List of checkpoint metadata dictionaries
         """
-        checkpoints = []
-        
-        for metadata_file in self.checkpoint_dir.glob("*.json"):
-            try:
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
-                
-                # Filter by session if specified
-                if session_id and metadata.get("session_id") != session_id:
-                    continue
-                
-                # Verify checkpoint file exists
-                checkpoint_id = metadata.get("checkpoint_id")
-                if checkpoint_id and self._get_checkpoint_path(checkpoint_id).exists():
-                    checkpoints.append(metadata)
-                    
-            except Exception as e:
-                logger.warning(f"Failed to read metadata {metadata_file}: {e}")
-                continue
+        with self._index_lock:
+            self._refresh_index()
+            if session_id:
+                checkpoints = list(self._sessions.get(session_id, {}).values())
+            else:
+                checkpoints = list(self._index.values())
         
         # Sort by creation time, newest first
-        checkpoints.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        checkpoints.sort(key=lambda x: x["created_ns"], reverse=True)
         return checkpoints
     
     def delete_checkpoint(self, checkpoint_id: str) -> bool:
@@ -146,20 +823,24 @@ class CheckpointManager:
         Returns:
             True if deleted, False if not found
         """
-        checkpoint_path = self._get_checkpoint_path(checkpoint_id)
+        self._wait_for(checkpoint_id)
+        checkpoint_path = self._find_checkpoint_file(checkpoint_id)
         metadata_path = self._get_metadata_path(checkpoint_id)
         
         deleted = False
         
-        if checkpoint_path.exists():
-            checkpoint_path.unlink()
-            deleted = True
-        
-        if metadata_path.exists():
-            metadata_path.unlink()
-            deleted = True
+        # A rename is a single directory-entry update; freeing the blocks
+        # is left to the writer thread
+        for path in filter(None, (checkpoint_path, metadata_path)):
+            try:
+                os.replace(path, self.trash_dir / path.name)
+                deleted = True
+            except FileNotFoundError:
+                pass
         
         if deleted:
+            self._append_index({"delete": checkpoint_id})
+            self._schedule_purge()
             logger.info(f"Deleted checkpoint {checkpoint_id}")
         
         return deleted
@@ -184,15 +865,173 @@ class CheckpointManager:
         if len(checkpoints) <= keep_count:
             return 0
         
-        # Delete older checkpoints
-        to_delete = checkpoints[keep_count:]
-        deleted = 0
+        # Delete older checkpoints; the renames are I/O-bound, so issue them
+        # concurrently (matters on network filesystems)
+        to_delete = [cp["checkpoint_id"] for cp in checkpoints[keep_count:]]
         
-        for cp in to_delete:
-            if self.delete_checkpoint(cp["checkpoint_id"]):
-                deleted += 1
+        with ThreadPoolExecutor(max_workers=min(CLEANUP_WORKERS, len(to_delete))) as executor:
+            return sum(executor.map(self.delete_checkpoint, to_delete))
+    
+    # ----------------------------------------
+    # Index
+    # ----------------------------------------
+    
+    @contextmanager
+    def _locked_index_file(self):
+        """Hold the index write lock (threads of this process, and other processes via flock)."""
+        with self._file_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self._lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _append_index(self, record: Dict[str, Any]):
+        """Append a metadata record or tombstone to the index."""
+        line = _dump_index_record(record)
+        with self._locked_index_file():
+            with open(self._index_path, 'ab+') as f:
+                # Never glue a record onto a line torn by a crashed writer
+                if f.seek(0, os.SEEK_END):
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        line = b"\n" + line
+                f.write(line)
         
-        return deleted
+        with self._index_lock:
+            self._refresh_index()
+    
+    def _reset_index(self):
+        """Forget the replayed index so it is read again from the start."""
+        self._index = {}
+        self._sessions = {}
+        self._index_pos = 0
+        self._index_lines = 0
+        self._index_inode = None
+    
+    def _read_index_tail(self) -> bool:
+        """
+        Replay index lines appended since the last read.
+        
+        Returns:
+            False if there is no index file
+        """
+        try:
+            f = open(self._index_path, 'rb')
+        except FileNotFoundError:
+            return False
+        
+        with f:
+            stat = os.fstat(f.fileno())
+            # Replaced (compacted/rebuilt) or truncated: start over
+            if stat.st_ino != self._index_inode or stat.st_size < self._index_pos:
+                self._reset_index()
+                self._index_inode = stat.st_ino
+            if stat.st_size == self._index_pos:
+                return True
+            
+            f.seek(self._index_pos)
+            data = f.read(stat.st_size - self._index_pos)
+        
+        # Only consume complete lines; a line being appended is picked up later
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            self._index_lines += 1
+            try:
+                record = _load_index_record(line)
+            except ValueError as e:
+                logger.warning(f"Skipping unreadable checkpoint index line: {e}")
+                continue
+            if "delete" in record:
+                self._drop_index_record(record["delete"])
+            elif record.get("checkpoint_id"):
+                if "created_ns" not in record:
+                    record["created_ns"] = _created_ns(record)
+                self._drop_index_record(record["checkpoint_id"])
+                self._index[record["checkpoint_id"]] = record
+                self._sessions.setdefault(record.get("session_id"), {})[record["checkpoint_id"]] = record
+        self._index_pos += end
+        return True
+    
+    def _drop_index_record(self, checkpoint_id: str):
+        """Remove a checkpoint from the in-memory index."""
+        record = self._index.pop(checkpoint_id, None)
+        if record is None:
+            return
+        session = self._sessions.get(record.get("session_id"))
+        if session is not None:
+            session.pop(checkpoint_id, None)
+            if not session:
+                del self._sessions[record.get("session_id")]
+    
+    def _refresh_index(self):
+        """Bring the in-memory index up to date (caller holds _index_lock)."""
+        if not self._read_index_tail():
+            self._rebuild_index()
+            return
+        
+        # Mostly superseded records and tombstones: rewrite with live entries
+        if (self._index_lines >= INDEX_COMPACT_MIN_LINES
+                and self._index_lines > INDEX_COMPACT_RATIO * len(self._index)):
+            self._compact_index()
+    
+    def _write_index(self, records: List[Dict[str, Any]]):
+        """Atomically replace the index file (caller holds the index file lock)."""
+        _write_atomically(
+            self._index_path,
+            lambda f: f.writelines(_dump_index_record(record) for record in records)
+        )
+        self._reset_index()
+        self._read_index_tail()
+    
+    def _compact_index(self):
+        """Rewrite the index with only the live checkpoints."""
+        with self._locked_index_file():
+            # Include anything appended by other writers since the last read
+            self._read_index_tail()
+            self._write_index(list(self._index.values()))
+        logger.info(f"Compacted checkpoint index to {len(self._index)} entries")
+    
+    def _rebuild_index(self):
+        """Recreate the index from the per-checkpoint metadata files."""
+        # One directory read yields both the metadata files and the set of
+        # checkpoints whose state file exists
+        metadata_paths = []
+        state_ids = set()
+        with os.scandir(self.checkpoint_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                stem, ext = os.path.splitext(entry.name)
+                if ext == ".json":
+                    metadata_paths.append(Path(entry.path))
+                elif ext in STATE_SUFFIXES:
+                    state_ids.add(stem)
+        
+        records = []
+        for path in metadata_paths:
+            try:
+                metadata = _load_metadata(path)
+            except Exception as e:
+                logger.warning(f"Failed to read metadata {path}: {e}")
+                continue
+            if metadata.get("checkpoint_id") in state_ids:
+                records.append(metadata)
+        
+        with self._locked_index_file():
+            self._write_index(records)
+        logger.info(f"Rebuilt checkpoint index with {len(records)} entries")
+    
+    def rebuild_index(self):
+        """Recreate the checkpoint index from the metadata files on disk."""
+        with self._index_lock:
+            self._rebuild_index()
 
 
 # Global checkpoint manager instance
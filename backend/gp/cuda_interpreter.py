@@ -0,0 +1,149 @@
+"""
+GPU evaluation of postfix programs with Numba CUDA.
+
+Runs a whole batch of programs from interpreter.compile_postfix over all
+training samples in one kernel launch: one thread per (program, sample
+stride), each running the program on a small local stack. Squared errors are
+accumulated per program on the device, so only one MSE per program is copied
+back.
+
+Optional: without numba or a CUDA device, create_cuda_evaluator returns None
+and callers stay on the CPU interpreter.
+"""
+import math
+from typing import List, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+
+from .interpreter import CONST_BASE, UNARY_OPCODES, VAR_BASE, apply_binary, apply_unary
+
+try:
+    from numba import cuda
+except ImportError:
+    cuda = None
+
+logger = logging.getLogger(__name__)
+
+# Deepest stack a program may need; trees over MAX_TREE_SIZE are never evaluated
+MAX_STACK = 32
+
+# Threads per block along the sample axis
+THREADS_PER_BLOCK = 256
+
+# Sample blocks per program; each thread walks the samples with this stride
+MAX_SAMPLE_BLOCKS = 32
+
+
+if cuda is not None:
+
+    _apply_binary = cuda.jit(device=True)(apply_binary)
+    _apply_unary = cuda.jit(device=True)(apply_unary)
+
+    @cuda.jit(cache=True)
+    def _sse_kernel(code, code_offsets, consts, const_offsets, columns, y, unary, sse):
+        """Sum of squared errors of program blockIdx.x over all samples."""
+        program = cuda.blockIdx.x
+        start = code_offsets[program]
+        end = code_offsets[program + 1]
+        const_start = const_offsets[program]
+        n_samples = y.shape[0]
+        stack = cuda.local.array(MAX_STACK, dtype=np.float64)
+
+        total = 0.0
+        sample = cuda.blockIdx.y * cuda.blockDim.x + cuda.threadIdx.x
+        stride = cuda.gridDim.y * cuda.blockDim.x
+        while sample < n_samples:
+            top = 0
+            for pc in range(start, end):
+                op = code[pc]
+                if op >= CONST_BASE:
+                    stack[top] = consts[const_start + op - CONST_BASE]
+                    top += 1
+                elif op >= VAR_BASE:
+                    stack[top] = columns[op - VAR_BASE, sample]
+                    top += 1
+                elif unary[op]:
+                    stack[top - 1] = _apply_unary(op, stack[top - 1])
+                else:
+                    # The first pop is the first argument
+                    stack[top - 2] = _apply_binary(op, stack[top - 1], stack[top - 2])
+                    top -= 1
+
+            # Same cleanup as predict_postfix
+            prediction = stack[0]
+            if not math.isfinite(prediction):
+                prediction = 0.0
+            prediction = min(max(prediction, -1e10), 1e10)
+            error = prediction - y[sample]
+            total += error * error
+            sample += stride
+
+        cuda.atomic.add(sse, program, total)
+
+
+class CudaEvaluator:
+    """
+    Computes batch_mse on a CUDA device.
+
+    Training columns and targets are copied to the device once; each call
+    only transfers the concatenated programs and the resulting MSE vector.
+    Evaluation runs in double precision whatever the data dtype.
+    """
+
+    def __init__(self, columns: np.ndarray, y: np.ndarray):
+        self.n_samples = len(y)
+        self._columns = cuda.to_device(np.ascontiguousarray(columns, dtype=np.float64))
+        self._y = cuda.to_device(np.ascontiguousarray(y, dtype=np.float64))
+        self._unary = cuda.to_device(UNARY_OPCODES)
+
+    def mse(self, programs: Sequence[Tuple[List[int], List[float]]]) -> np.ndarray:
+        """
+        Mean squared error of each program's predictions (see interpreter.batch_mse).
+
+        Args:
+            programs: (code, consts) pairs from compile_postfix
+
+        Returns:
+            MSE per program
+        """
+        code_offsets = np.zeros(len(programs) + 1, dtype=np.int64)
+        const_offsets = np.zeros(len(programs) + 1, dtype=np.int64)
+        np.cumsum([len(code) for code, _ in programs], out=code_offsets[1:])
+        np.cumsum([len(consts) for _, consts in programs], out=const_offsets[1:])
+        code = np.fromiter(
+            (op for program_code, _ in programs for op in program_code),
+            dtype=np.int32, count=int(code_offsets[-1])
+        )
+        consts = np.fromiter(
+            (value for _, program_consts in programs for value in program_consts),
+            dtype=np.float64, count=int(const_offsets[-1])
+        )
+        if not len(consts):
+            consts = np.zeros(1)
+
+        sse = cuda.to_device(np.zeros(len(programs)))
+        sample_blocks = min(MAX_SAMPLE_BLOCKS, -(-self.n_samples // THREADS_PER_BLOCK))
+        _sse_kernel[(len(programs), sample_blocks), THREADS_PER_BLOCK](
+            cuda.to_device(code), cuda.to_device(code_offsets),
+            cuda.to_device(consts), cuda.to_device(const_offsets),
+            self._columns, self._y, self._unary, sse
+        )
+        return sse.copy_to_host() / self.n_samples
+
+
+def create_cuda_evaluator(columns: np.ndarray, y: np.ndarray) -> Optional[CudaEvaluator]:
+    """
+    Build a CudaEvaluator for the training data, if a CUDA device is usable.
+
+    Returns:
+        Evaluator, or None without numba or a CUDA device
+    """
+    if cuda is None or not cuda.is_available():
+        return None
+
+    try:
+        return CudaEvaluator(columns, y)
+    except Exception as e:
+        logger.warning(f"CUDA evaluation unavailable: {e}")
+        return None
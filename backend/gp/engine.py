@@ -8,30 +8,58 @@ SOTA Techniques Implemented:
 - Strict Size Limits: Hard cap on tree size (20 nodes max)
 - Multi-objective Hall of Fame: Track best by fitness AND simplicity
 """
+import copy
+import heapq
+import itertools
+import multiprocessing
+import os
 import numpy as np
-import random
 import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from deap import base, creator, tools, gp
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Tuple
 import logging
+from cachetools import LRUCache
 from sklearn.model_selection import train_test_split
 
 from .primitives import create_primitive_set
-from .fitness import (
-    evaluate_individual_vectorized,
-    calculate_r_squared, 
-    calculate_mse, 
-    calculate_aic,
-    calculate_bic,
-    calculate_parsimony_score,
-    get_predictions_vectorized,
+from .fitness import calculate_all_metrics, calculate_total_sum_of_squares
+from .cuda_interpreter import MAX_STACK, create_cuda_evaluator
+from .interpreter import (
+    batch_mse,
+    batch_mse_worker,
+    check_primitive_set,
+    compile_postfix,
+    init_worker,
+    jit_batch_mse,
+    predict_postfix,
+    to_columns,
+    tree_key,
 )
-from .equation_formatter import simplify_equation
+from .equation_formatter import simplify_equation, unformatted_equation
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared generator for selection and variation draws
+_rng = np.random.default_rng()
+
+# Worker processes only pay for their IPC above this much work per batch
+# (individuals x training samples)
+PARALLEL_EVAL_MIN_WORK = 200_000
+
+# Batches are sent to a CUDA device (when available) above this much work;
+# below it the launch and transfer overhead is not amortized
+CUDA_EVAL_MIN_WORK = 1_000_000
+
+# Compiled postfix programs kept for reuse across generations
+PROGRAM_CACHE_SIZE = 4096
+
+# Reported individuals (hall of fame, best, Pareto front) whose predictions are kept
+PREDICTION_CACHE_SIZE = 64
+
 # Create fitness and individual classes at module level (only once)
 if not hasattr(creator, "FitnessMin"):
     creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
@@ -44,6 +72,14 @@ def operator_len(individual):
     return len(individual)
 
 
+def _fitness_and_size(individuals):
+    """First fitness value and length of each individual, as arrays."""
+    n = len(individuals)
+    fitness = np.fromiter((ind.fitness.values[0] for ind in individuals), dtype=np.float64, count=n)
+    sizes = np.fromiter(map(len, individuals), dtype=np.float64, count=n)
+    return fitness, sizes
+
+
 def sel_lexicographic(individuals, k, tournsize=7, epsilon=0.01):
     """
     SOTA: Lexicographic Tournament Selection.
@@ -52,28 +88,29 @@ def sel_lexicographic(individuals, k, tournsize=7, epsilon=0.01):
     prefers the simpler (shorter) individual. This prevents bloat while 
     maintaining selection pressure for good solutions.
     
+    All k tournaments are drawn and decided at once with NumPy; aspirants are
+    drawn with replacement, as in DEAP's selTournament.
+    
     Reference: Luke & Panait (2006) "A Comparison of Bloat Control Methods"
     """
-    selected = []
-    for _ in range(k):
-        # Select random individuals for tournament
-        aspirants = random.sample(individuals, min(tournsize, len(individuals)))
-        
-        # Sort by fitness (lower is better)
-        aspirants.sort(key=lambda x: x.fitness.values[0])
-        
-        # Get best fitness
-        best_fitness = aspirants[0].fitness.values[0]
-        
-        # Find all individuals within epsilon of best
-        similar = [ind for ind in aspirants 
-                   if abs(ind.fitness.values[0] - best_fitness) < epsilon * max(1, abs(best_fitness))]
-        
-        # Among similar fitness, select shortest (simplest)
-        winner = min(similar, key=len)
-        selected.append(winner)
+    fitness, sizes = _fitness_and_size(individuals)
+    aspirants = _rng.integers(0, len(individuals), size=(k, tournsize))
+    
+    # Get best fitness of each tournament
+    aspirant_fitness = fitness[aspirants]
+    best_fitness = aspirant_fitness.min(axis=1, keepdims=True)
+    
+    # Find all individuals within epsilon of best
+    tolerance = epsilon * np.maximum(1, np.abs(best_fitness))
+    gap = aspirant_fitness - best_fitness
+    similar = gap < tolerance
+    
+    # Among similar fitness, select shortest (simplest); gap / tolerance is in
+    # [0, 1), so it only breaks ties in size, in favour of better fitness
+    key = np.where(similar, sizes[aspirants] + gap / tolerance, np.inf)
+    winners = aspirants[np.arange(k), key.argmin(axis=1)]
     
-    return selected
+    return [individuals[i] for i in winners.tolist()]
 
 
 def sel_double_tournament(individuals, k, fitness_size=7, parsimony_size=1.4):
@@ -85,23 +122,72 @@ def sel_double_tournament(individuals, k, fitness_size=7, parsimony_size=1.4):
     
     Reference: Luke (2000) "Two Fast Tree-Creation Algorithms for GP"
     """
-    selected = []
-    for _ in range(k):
-        # First tournament: by fitness
-        aspirants = random.sample(individuals, min(fitness_size, len(individuals)))
-        winner1 = min(aspirants, key=lambda x: x.fitness.values[0])
-        
-        # Second tournament: compare with random individual by size
-        if random.random() < 1.0 / parsimony_size:
-            competitor = random.choice(individuals)
-            if len(competitor) < len(winner1):
-                # Only replace if competitor has reasonable fitness
-                if competitor.fitness.values[0] < winner1.fitness.values[0] * 1.5:
-                    winner1 = competitor
-        
-        selected.append(winner1)
-    
-    return selected
+    fitness, sizes = _fitness_and_size(individuals)
+    n = len(individuals)
+    
+    # First tournament: by fitness
+    aspirants = _rng.integers(0, n, size=(k, fitness_size))
+    winners = aspirants[np.arange(k), fitness[aspirants].argmin(axis=1)]
+    
+    # Second tournament: compare with random individual by size, and only
+    # replace if the competitor has reasonable fitness
+    competitors = _rng.integers(0, n, size=k)
+    replace = (
+        (_rng.random(k) < 1.0 / parsimony_size)
+        & (sizes[competitors] < sizes[winners])
+        & (fitness[competitors] < fitness[winners] * 1.5)
+    )
+    winners = np.where(replace, competitors, winners)
+    
+    return [individuals[i] for i in winners.tolist()]
+
+
+class SimplestHallOfFame:
+    """
+    The smallest distinct individuals seen so far, bounded to maxsize.
+    
+    Members are kept in a max-heap on tree size, so checking a candidate
+    against the largest member and replacing it are O(1) and O(log k).
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._heap = []  # (-size, insertion order, individual)
+        self._keys = set()
+        self._order = itertools.count()
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def __iter__(self):
+        return (entry[2] for entry in self._heap)
+    
+    @property
+    def full(self) -> bool:
+        return len(self._heap) >= self.maxsize
+    
+    @property
+    def largest_size(self) -> int:
+        """Size of the largest member."""
+        return -self._heap[0][0]
+    
+    def insert(self, individual):
+        """Add a copy of individual if it is new and smaller than the largest member (when full)."""
+        key = tree_key(individual)
+        if key in self._keys or (self.full and len(individual) >= self.largest_size):
+            return
+        
+        entry = (-len(individual), next(self._order), copy.deepcopy(individual))
+        if self.full:
+            removed = heapq.heapreplace(self._heap, entry)
+            self._keys.discard(tree_key(removed[2]))
+        else:
+            heapq.heappush(self._heap, entry)
+        self._keys.add(key)
+    
+    def best(self):
+        """Member with the best fitness."""
+        return max(self, key=lambda ind: ind.fitness)
 
 
 class GPEngine:
@@ -136,10 +222,14 @@ class GPEngine:
         update_interval: float = 0.5,
         test_size: float = 0.2,
         random_state: int = 42,
+        dtype: np.dtype = np.float32,
+        n_workers: Optional[int] = None,
         **kwargs
     ):
-        self.X = np.array(X, dtype=np.float64)
-        self.y = np.array(y, dtype=np.float64)
+        # asarray: no extra copy when the caller already hands over this dtype
+        self.dtype = np.dtype(dtype)
+        self.X = np.asarray(X, dtype=self.dtype)
+        self.y = np.asarray(y, dtype=self.dtype)
         self.variable_names = [self._sanitize_name(name) for name in variable_names]
         self.operators = operators
         self.functions = functions
@@ -152,6 +242,10 @@ class GPEngine:
         self.update_interval = update_interval
         self.test_size = test_size
         self.random_state = random_state
+        # Processes for population evaluation (default: one per CPU; none
+        # when the compiled batch kernel already spreads over all cores)
+        self.n_workers = n_workers or (1 if jit_batch_mse is not None else os.cpu_count() or 1)
+        self._pool: Optional[ProcessPoolExecutor] = None
         
         # SOTA: Adaptive parsimony - starts low, increases over generations
         self.base_parsimony = parsimony_coefficient
@@ -166,17 +260,51 @@ class GPEngine:
             test_size=test_size, 
             random_state=random_state
         )
+        # Contiguous per-variable columns, shared by every tree evaluation
+        self._X_train_cols = to_columns(self.X_train)
+        self._X_test_cols = to_columns(self.X_test)
+        # GPU evaluator, only for data large enough to use it
+        self._cuda = None
+        if len(self.y_train) * min(population_size, 500) >= CUDA_EVAL_MIN_WORK:
+            self._cuda = create_cuda_evaluator(self._X_train_cols, self.y_train)
+        
+        # Plot data sent with every reported individual, serialized once (shared, do not mutate).
+        # For single variable, use actual x values; otherwise use sample indices
+        # (test indices offset from train size for clarity)
+        self._n_features = self.X_train.shape[1]
+        n_train = len(self.y_train)
+        if self._n_features == 1:
+            self._train_x_list = self.X_train[:, 0].tolist()
+            self._test_x_list = self.X_test[:, 0].tolist()
+        else:
+            self._train_x_list = list(range(n_train))
+            self._test_x_list = list(range(n_train, n_train + len(self.y_test)))
+        self._train_y_list = self.y_train.tolist()
+        self._test_y_list = self.y_test.tolist()
         
         logger.info(f"GPEngine initialized (SOTA bloat control):")
         logger.info(f"  - Total samples: {len(self.y)}")
         logger.info(f"  - Train samples: {len(self.y_train)}")
         logger.info(f"  - Test samples: {len(self.y_test)}")
         logger.info(f"  - Variables: {self.variable_names}")
+        logger.info(f"  - Data dtype: {self.dtype}")
         logger.info(f"  - Population: {self.population_size}")
         logger.info(f"  - Max depth: {self.max_depth} (strict limit: {self.MAX_TREE_DEPTH})")
         logger.info(f"  - Max tree size: {self.MAX_TREE_SIZE} nodes")
         logger.info(f"  - Parsimony coefficient: {self.parsimony_coefficient}")
         
+        # Train-set MSE per tree, keyed by tree_key(individual); fitness is rebuilt
+        # from it because the parsimony penalty changes over a run
+        self._mse_cache: LRUCache = LRUCache(maxsize=10 * self.population_size)
+        # Total sums of squares of the targets, for R² without re-centering y
+        self._y_train_sst = calculate_total_sum_of_squares(self.y_train)
+        self._y_test_sst = calculate_total_sum_of_squares(self.y_test)
+        # Postfix programs, keyed by tree_key(individual)
+        self._program_cache: LRUCache = LRUCache(maxsize=PROGRAM_CACHE_SIZE)
+        # Predictions of recently reported trees, keyed by tree_key(individual)
+        self._pred_cache_train: LRUCache = LRUCache(maxsize=PREDICTION_CACHE_SIZE)
+        self._pred_cache_test: LRUCache = LRUCache(maxsize=PREDICTION_CACHE_SIZE)
+        
         self._setup_deap()
         
         self.hall_of_fame: List[Dict[str, Any]] = []
@@ -211,6 +339,9 @@ class GPEngine:
             self.operators,
             self.functions
         )
+        check_primitive_set(self.pset)
+        # Variable name -> column index, for the postfix interpreter
+        self._arg_index = {name: i for i, name in enumerate(self.pset.arguments)}
         
         self.toolbox = base.Toolbox()
         
@@ -261,35 +392,124 @@ class GPEngine:
         logger.info("DEAP toolbox setup complete with SOTA bloat control")
     
     def _evaluate_individual(self, individual) -> tuple:
+        """Evaluate a single individual (see _evaluate_population)."""
+        return self._evaluate_population([individual])[0]
+    
+    def _evaluate_population(self, individuals: List) -> List[tuple]:
         """
-        Evaluate with adaptive parsimony pressure.
+        Evaluate individuals with adaptive parsimony pressure.
         
-        Fitness = MSE + parsimony_coefficient * complexity^2
+        Fitness = MSE + parsimony_coefficient * complexity^1.5
         
-        The quadratic penalty strongly discourages complex solutions.
+        Predictions are stacked into one (individuals, n_train) matrix so MSE
+        and the complexity penalty are computed for the whole batch in single
+        NumPy reductions. Large batches are split across worker processes.
+        Trees over MAX_TREE_SIZE get the worst fitness without being evaluated.
         """
-        # Base evaluation
-        pred = get_predictions_vectorized(individual, self.toolbox, self.X_train)
-        mse = calculate_mse(self.y_train, pred)
+        if not individuals:
+            return []
         
-        # SOTA: Quadratic complexity penalty
-        complexity = len(individual)
-        complexity_penalty = self.adaptive_parsimony * (complexity ** 1.5)
+        complexity = np.fromiter(map(len, individuals), dtype=np.int64, count=len(individuals))
+        oversized = complexity > self.MAX_TREE_SIZE
         
-        fitness = mse + complexity_penalty
+        mse = np.full(len(individuals), np.inf)
+        if oversized.any():
+            within = np.flatnonzero(~oversized)
+            mse[within] = self._population_mse([individuals[i] for i in within.tolist()])
+        else:
+            mse = self._population_mse(individuals)
         
-        # Extra penalty for exceeding size limit
-        if complexity > self.MAX_TREE_SIZE:
-            fitness += 1e6
+        # SOTA: Super-linear complexity penalty
+        fitness = mse + self.adaptive_parsimony * complexity ** 1.5
         
-        if not np.isfinite(fitness) or fitness > 1e10:
-            fitness = 1e10
+        fitness = np.where(np.isfinite(fitness) & (fitness <= 1e10), fitness, 1e10)
+        return [(value,) for value in fitness.tolist()]
+    
+    def _population_mse(self, individuals: List) -> np.ndarray:
+        """
+        Train-set MSE of each individual.
         
-        return (float(fitness),)
+        Trees seen before (same tree_key) are answered from the cache; the rest,
+        deduplicated, are evaluated in one batch.
+        """
+        mse = np.empty(len(individuals))
+        missing: Dict[Tuple, List[int]] = {}
+        for i, individual in enumerate(individuals):
+            key = tree_key(individual)
+            cached = self._mse_cache.get(key)
+            if cached is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                mse[i] = cached
+        
+        if missing:
+            programs = [
+                self._program(key, individuals[positions[0]])
+                for key, positions in missing.items()
+            ]
+            work = len(programs) * len(self.y_train)
+            if self._cuda is not None and work >= CUDA_EVAL_MIN_WORK:
+                values = self._cuda_mse(programs)
+            elif self.n_workers > 1 and work >= PARALLEL_EVAL_MIN_WORK:
+                values = self._parallel_mse(programs)
+            else:
+                values = batch_mse(programs, self._X_train_cols, self.y_train)
+            
+            for (key, positions), value in zip(missing.items(), values.tolist()):
+                self._mse_cache[key] = value
+                mse[positions] = value
+        
+        return mse
     
-    def _evaluate_population(self, individuals: List) -> List[tuple]:
-        """Evaluate all individuals in population."""
-        return [self._evaluate_individual(ind) for ind in individuals]
+    def _train_r_squared(self, individuals) -> np.ndarray:
+        """
+        Train-set R² of each individual, derived from its (cached) MSE.
+        
+        Same result as calculate_r_squared on their predictions, which are
+        always finite.
+        """
+        n_train = len(self.y_train)
+        if n_train < 2:
+            return np.zeros(len(individuals))
+        
+        sse = self._population_mse(individuals) * n_train
+        if self._y_train_sst < 1e-10:
+            return np.where(sse < 1e-10, 1.0, 0.0)
+        return np.clip(1.0 - sse / self._y_train_sst, 0.0, 1.0)
+    
+    def _cuda_mse(self, programs: List) -> np.ndarray:
+        """Compute batch_mse on the CUDA device, falling back to the CPU for good if it fails."""
+        if max(len(code) for code, _ in programs) <= MAX_STACK:
+            try:
+                return self._cuda.mse(programs)
+            except Exception as e:
+                logger.warning(f"CUDA evaluation failed, evaluating on the CPU: {e}")
+                self._cuda = None
+        if self.n_workers > 1:
+            return self._parallel_mse(programs)
+        return batch_mse(programs, self._X_train_cols, self.y_train)
+    
+    def _parallel_mse(self, programs: List) -> np.ndarray:
+        """Compute batch_mse over the worker pool, one contiguous chunk per worker."""
+        if self._pool is None:
+            # forkserver: forking this (multi-threaded) server process is unsafe
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                mp_context=multiprocessing.get_context(method),
+                initializer=init_worker,
+                initargs=(self._X_train_cols, self.y_train)
+            )
+        
+        size = -(-len(programs) // self.n_workers)
+        chunks = [programs[i:i + size] for i in range(0, len(programs), size)]
+        try:
+            return np.concatenate(list(self._pool.map(batch_mse_worker, chunks)))
+        except BrokenProcessPool as e:
+            logger.warning(f"Evaluation workers failed, evaluating in-process: {e}")
+            self._pool = None
+            self.n_workers = 1
+            return batch_mse(programs, self._X_train_cols, self.y_train)
     
     def _update_adaptive_parsimony(self):
         """
@@ -303,20 +523,55 @@ class GPEngine:
             factor = 1.0 + (self.current_generation / 200)
             self.adaptive_parsimony = self.base_parsimony * min(factor, 5.0)
     
+    def _program(self, key: Tuple, individual):
+        """Postfix program of an individual whose tree_key is key, compiled once per tree structure."""
+        program = self._program_cache.get(key)
+        if program is None:
+            program = compile_postfix(individual, self._arg_index)
+            self._program_cache[key] = program
+        return program
+    
+    def _cached_predictions(self, individual, cache: LRUCache, columns) -> np.ndarray:
+        """Predictions of an individual over columns, memoized in cache by tree structure."""
+        key = tree_key(individual)
+        predictions = cache.get(key)
+        if predictions is None:
+            n_samples = len(columns[0])
+            try:
+                code, consts = self._program(key, individual)
+            except Exception:
+                predictions = np.zeros(n_samples)
+            else:
+                predictions = predict_postfix(code, consts, columns, n_samples)
+            predictions.flags.writeable = False
+            cache[key] = predictions
+        return predictions
+    
     def _individual_to_dict(self, individual, include_test: bool = True, 
-                            include_predictions: bool = False) -> Dict[str, Any]:
-        """Convert an individual to a dictionary with metrics."""
+                            include_predictions: bool = False,
+                            simplify: bool = False) -> Dict[str, Any]:
+        """
+        Convert an individual to a dictionary with metrics.
+        
+        SymPy simplification is slow, so it only runs with simplify=True
+        (final results); otherwise equation_formatted holds the raw expression.
+        """
         try:
             complexity = len(individual)
             
             # Train metrics
-            pred_train = get_predictions_vectorized(individual, self.toolbox, self.X_train)
-            mse_train = calculate_mse(self.y_train, pred_train)
-            r2_train = calculate_r_squared(self.y_train, pred_train)
+            pred_train = self._cached_predictions(individual, self._pred_cache_train, self._X_train_cols)
+            train_metrics = calculate_all_metrics(self.y_train, pred_train, complexity, self._y_train_sst)
+            mse_train = train_metrics["mse"]
+            r2_train = train_metrics["r_squared"]
             
             # Format equation using SymPy
             equation_str = str(individual)
-            equation_formatted = simplify_equation(equation_str)
+            if simplify:
+                # Memoized in equation_formatter across runs
+                equation_formatted = simplify_equation(equation_str)
+            else:
+                equation_formatted = unformatted_equation(equation_str)
             
             result = {
                 "equation": equation_str,
@@ -332,43 +587,30 @@ class GPEngine:
             # Include predictions for visualization
             if include_predictions:
                 result["train_predictions"] = pred_train.tolist()
-                # For single variable, use actual x values; otherwise use sample indices
-                if self.X_train.shape[1] == 1:
-                    result["train_x"] = self.X_train[:, 0].tolist()
-                else:
-                    result["train_x"] = list(range(len(self.y_train)))
-                result["train_y"] = self.y_train.tolist()
-                result["n_features"] = self.X_train.shape[1]
+                result["train_x"] = self._train_x_list
+                result["train_y"] = self._train_y_list
+                result["n_features"] = self._n_features
             
             if include_test:
-                pred_test = get_predictions_vectorized(individual, self.toolbox, self.X_test)
-                mse_test = calculate_mse(self.y_test, pred_test)
-                r2_test = calculate_r_squared(self.y_test, pred_test)
-                
-                n_test = len(self.y_test)
-                aic = calculate_aic(mse_test, n_test, complexity)
-                bic = calculate_bic(mse_test, n_test, complexity)
-                parsimony_score = calculate_parsimony_score(r2_test, complexity, alpha=0.02)
-                overfit_gap = r2_train - r2_test
+                pred_test = self._cached_predictions(individual, self._pred_cache_test, self._X_test_cols)
+                test_metrics = calculate_all_metrics(
+                    self.y_test, pred_test, complexity, self._y_test_sst, alpha=0.02
+                )
+                r2_test = test_metrics["r_squared"]
                 
                 result.update({
                     "test_r_squared": r2_test,
-                    "test_mse": mse_test,
-                    "aic": aic,
-                    "bic": bic,
-                    "parsimony_score": parsimony_score,
-                    "overfit_gap": overfit_gap,
+                    "test_mse": test_metrics["mse"],
+                    "aic": test_metrics["aic"],
+                    "bic": test_metrics["bic"],
+                    "parsimony_score": test_metrics["parsimony_score"],
+                    "overfit_gap": r2_train - r2_test,
                 })
                 
                 if include_predictions:
                     result["test_predictions"] = pred_test.tolist()
-                    # For single variable, use actual x values; otherwise use sample indices
-                    if self.X_test.shape[1] == 1:
-                        result["test_x"] = self.X_test[:, 0].tolist()
-                    else:
-                        # Use indices offset from train size for clarity
-                        result["test_x"] = list(range(len(self.y_train), len(self.y_train) + len(self.y_test)))
-                    result["test_y"] = self.y_test.tolist()
+                    result["test_x"] = self._test_x_list
+                    result["test_y"] = self._test_y_list
             
             return result
             
@@ -388,16 +630,17 @@ class GPEngine:
         """
         SOTA: Aggressive pruning of oversized individuals.
         
-        Replace bloated individuals with new random ones.
+        Replace bloated individuals with new random ones, generated in one batch.
         """
-        pruned = 0
-        for i, ind in enumerate(population):
-            if len(ind) > self.MAX_TREE_SIZE:
-                population[i] = self.toolbox.individual()
-                pruned += 1
+        sizes = np.fromiter(map(len, population), dtype=np.int64, count=len(population))
+        oversized = np.flatnonzero(sizes > self.MAX_TREE_SIZE).tolist()
+        if not oversized:
+            return
+        
+        for i, ind in zip(oversized, self.toolbox.population(n=len(oversized))):
+            population[i] = ind
         
-        if pruned > 0:
-            logger.debug(f"Pruned {pruned} oversized individuals")
+        logger.debug(f"Pruned {len(oversized)} oversized individuals")
     
     async def evolve(self, callback: Optional[Callable] = None) -> Dict[str, Any]:
         """Run evolution with SOTA bloat control."""
@@ -419,7 +662,7 @@ class GPEngine:
             
             # SOTA: Two halls of fame - best fitness and simplest good
             hof = tools.HallOfFame(10)
-            simplest_hof = tools.HallOfFame(10)  # For tracking simple solutions
+            simplest_hof = SimplestHallOfFame(10)  # For tracking simple solutions
             self.hof = hof
             self.simplest_hof = simplest_hof
             
@@ -441,6 +684,9 @@ class GPEngine:
             logger.info(f"  Complexity: {best_init_info['complexity']}")
             
             last_update_time = time.time()
+            # Reported candidates are rebuilt only when they change
+            last_report_key = None
+            best_info = hof_list = None
             
             # Evolution loop
             while not self.should_stop:
@@ -453,18 +699,19 @@ class GPEngine:
                 offspring = self.toolbox.select(population, len(population))
                 offspring = list(map(self.toolbox.clone, offspring))
                 
-                # Crossover
-                for child1, child2 in zip(offspring[::2], offspring[1::2]):
-                    if random.random() < self.crossover_prob:
-                        self.toolbox.mate(child1, child2)
-                        del child1.fitness.values
-                        del child2.fitness.values
+                # Crossover (pairs chosen with one vectorized draw)
+                n_pairs = len(offspring) // 2
+                for i in np.flatnonzero(_rng.random(n_pairs) < self.crossover_prob).tolist():
+                    child1, child2 = offspring[2 * i], offspring[2 * i + 1]
+                    self.toolbox.mate(child1, child2)
+                    del child1.fitness.values
+                    del child2.fitness.values
                 
                 # Mutation
-                for mutant in offspring:
-                    if random.random() < self.mutation_prob:
-                        self.toolbox.mutate(mutant)
-                        del mutant.fitness.values
+                for i in np.flatnonzero(_rng.random(len(offspring)) < self.mutation_prob).tolist():
+                    mutant = offspring[i]
+                    self.toolbox.mutate(mutant)
+                    del mutant.fitness.values
                 
                 # SOTA: Prune oversized individuals
                 self._prune_population(offspring)
@@ -488,24 +735,34 @@ class GPEngine:
                     
                     # Use simplest good solution as "best" for reporting
                     best = self._get_best_parsimonious(hof, simplest_hof)
-                    best_info = self._individual_to_dict(best, include_predictions=True)
+                    report_key = tuple((tree_key(ind), ind.fitness.values) for ind in [best, *hof[:5]])
+                    if report_key != last_report_key:
+                        last_report_key = report_key
+                        best_info = self._individual_to_dict(best, include_predictions=True)
+                        # Include predictions for all top 5 candidates (for FitChart selection)
+                        hof_list = [self._individual_to_dict(ind, include_predictions=True) 
+                                    for ind in hof[:5]] if callback else None
                     elapsed = current_time - self.start_time
                     
-                    fitnesses_vals = [ind.fitness.values[0] for ind in population if ind.fitness.valid]
-                    complexities = [len(ind) for ind in population]
+                    fitnesses_vals = np.fromiter(
+                        (ind.fitness.values[0] for ind in population if ind.fitness.valid),
+                        dtype=np.float64
+                    )
+                    complexities = np.fromiter(map(len, population), dtype=np.int64, count=len(population))
+                    avg_complexity = float(complexities.mean())
                     
                     gen_stats = {
                         "generation": self.current_generation,
                         "elapsed_time": elapsed,
                         "generations_per_second": self.current_generation / elapsed if elapsed > 0 else 0,
-                        "best_fitness": float(min(fitnesses_vals)) if fitnesses_vals else 999.0,
-                        "avg_fitness": float(np.mean(fitnesses_vals)) if fitnesses_vals else 999.0,
-                        "std_fitness": float(np.std(fitnesses_vals)) if fitnesses_vals else 0.0,
+                        "best_fitness": float(fitnesses_vals.min()) if fitnesses_vals.size else 999.0,
+                        "avg_fitness": float(fitnesses_vals.mean()) if fitnesses_vals.size else 999.0,
+                        "std_fitness": float(fitnesses_vals.std()) if fitnesses_vals.size else 0.0,
                         "train_r_squared": best_info["train_r_squared"],
                         "test_r_squared": best_info.get("test_r_squared", 0),
                         "overfit_gap": best_info.get("overfit_gap", 0),
                         "best_complexity": best_info["complexity"],
-                        "avg_complexity": float(np.mean(complexities)),
+                        "avg_complexity": avg_complexity,
                         "aic": best_info.get("aic", 0),
                         "bic": best_info.get("bic", 0),
                         "parsimony_score": best_info.get("parsimony_score", 0),
@@ -519,15 +776,11 @@ class GPEngine:
                         f"Train R²={best_info['train_r_squared']:.4f}, "
                         f"Test R²={best_info.get('test_r_squared', 0):.4f}, "
                         f"Complexity={best_info['complexity']}, "
-                        f"AvgSize={np.mean(complexities):.1f}, "
+                        f"AvgSize={avg_complexity:.1f}, "
                         f"{self.current_generation/elapsed:.1f} gen/s"
                     )
                     
                     if callback:
-                        # Include predictions for all top 5 candidates (for FitChart selection)
-                        hof_list = [self._individual_to_dict(ind, include_predictions=True) 
-                                    for ind in hof[:5]]
-                        
                         update = {
                             "type": "generation_update",
                             "generation": self.current_generation,
@@ -547,9 +800,9 @@ class GPEngine:
             elapsed = time.time() - self.start_time
             logger.info(f"Evolution stopped after {self.current_generation} generations ({elapsed:.1f}s)")
             
-            self.hall_of_fame = [self._individual_to_dict(ind, include_predictions=True) 
+            self.hall_of_fame = [self._individual_to_dict(ind, include_predictions=True, simplify=True) 
                                  for ind in hof]
-            self.pareto_front = self._calculate_pareto_front(hof)
+            self.pareto_front = self._calculate_pareto_front(hof, simplify=True)
             
             if self.hall_of_fame:
                 logger.info(f"Best solution: {self.hall_of_fame[0]['equation']}")
@@ -579,32 +832,31 @@ class GPEngine:
             }
         finally:
             self.is_running = False
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
     
     def _update_simplest_hof(self, population, simplest_hof):
         """
         SOTA: Track simplest individuals with good fitness.
         
         Only add to simplest HOF if R² > 0.8 (good enough solution).
+        Individuals too large to enter a full HOF are skipped before their
+        R² is computed.
         """
         r2_threshold = 0.8
         
-        for ind in population:
-            if not ind.fitness.valid:
-                continue
-            
+        candidates = [ind for ind in population if ind.fitness.valid]
+        if simplest_hof.full:
+            largest = simplest_hof.largest_size
+            candidates = [ind for ind in candidates if len(ind) < largest]
+        if not candidates:
+            return
+        
+        for ind, r2 in zip(candidates, self._train_r_squared(candidates).tolist()):
             # Check if it's a good solution
-            try:
-                pred = get_predictions_vectorized(ind, self.toolbox, self.X_train)
-                r2 = calculate_r_squared(self.y_train, pred)
-                
-                if r2 >= r2_threshold:
-                    # Check if simpler than current simplest HOF members
-                    if len(simplest_hof) < simplest_hof.maxsize:
-                        simplest_hof.insert(ind)
-                    elif len(ind) < len(simplest_hof[-1]):
-                        simplest_hof.insert(ind)
-            except:
-                pass
+            if r2 >= r2_threshold:
+                simplest_hof.insert(ind)
     
     def _get_best_parsimonious(self, hof, simplest_hof):
         """
@@ -616,29 +868,22 @@ class GPEngine:
             return hof[0]
         
         best = hof[0]
-        simplest = simplest_hof[0]
+        simplest = simplest_hof.best()
         
         # Get R² for both
-        try:
-            pred_best = get_predictions_vectorized(best, self.toolbox, self.X_train)
-            r2_best = calculate_r_squared(self.y_train, pred_best)
-            
-            pred_simple = get_predictions_vectorized(simplest, self.toolbox, self.X_train)
-            r2_simple = calculate_r_squared(self.y_train, pred_simple)
-            
-            # If simplest is within 5% of best R², prefer simplest
-            if r2_simple >= r2_best * 0.95 and len(simplest) < len(best):
-                return simplest
-        except:
-            pass
+        r2_best, r2_simple = self._train_r_squared([best, simplest]).tolist()
+        
+        # If simplest is within 5% of best R², prefer simplest
+        if r2_simple >= r2_best * 0.95 and len(simplest) < len(best):
+            return simplest
         
         return best
     
-    def _calculate_pareto_front(self, individuals) -> List[Dict[str, Any]]:
+    def _calculate_pareto_front(self, individuals, simplify: bool = False) -> List[Dict[str, Any]]:
         """Calculate Pareto front based on Test R² and complexity."""
         candidates = []
         for ind in individuals:
-            info = self._individual_to_dict(ind, include_predictions=True)
+            info = self._individual_to_dict(ind, include_predictions=True, simplify=simplify)
             candidates.append(info)
         
         candidates.sort(key=lambda x: x["complexity"])
@@ -660,12 +905,18 @@ class GPEngine:
         self.should_stop = True
     
     def get_checkpoint_state(self) -> Dict[str, Any]:
-        """Get current state for checkpointing."""
+        """Get current state for checkpointing.
+        
+        Containers are copied so the snapshot can be serialized from another
+        thread while evolution keeps mutating the live ones. The population
+        copy is shallow: individuals are shared, which is safe because
+        evolution clones them before crossover and mutation.
+        """
         return {
             "generation": self.current_generation,
-            "population": self.population,
-            "hall_of_fame": self.hof,
-            "generation_stats": self.generation_stats,
+            "population": list(self.population),
+            "hall_of_fame": copy.deepcopy(self.hof),
+            "generation_stats": list(self.generation_stats),
             "adaptive_parsimony": self.adaptive_parsimony,
             "config": {
                 "population_size": self.population_size,
@@ -677,6 +928,7 @@ class GPEngine:
                 "variable_names": self.variable_names,
                 "operators": self.operators,
                 "functions": self.functions,
+                "dtype": self.dtype.name,
             },
             "data_info": {
                 "n_samples": len(self.y),
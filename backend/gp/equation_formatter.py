@@ -4,11 +4,13 @@ Equation Formatter using SymPy.
 Converts DEAP functional expressions to simplified mathematical notation
 and LaTeX format for human-readable display.
 """
+import operator
 import re
+import threading
 import sympy as sp
+from cachetools import LRUCache, cached
 from sympy import symbols, simplify, factor, latex, nsimplify
-from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,149 +18,118 @@ logger = logging.getLogger(__name__)
 # Define common symbols
 x, y, z = symbols('x y z')
 
-
-def _tokenize_deap_expr(expr_str: str) -> str:
-    """
-    Convert DEAP functional notation to infix notation.
-    
-    DEAP expressions look like: add(mul(x, 2.5), sub(x, 1))
-    We need to convert to: ((x * 2.5) + (x - 1))
-    """
-    # Replace protected/safe function names with standard ones
-    replacements = [
-        ('protected_div', 'div'),
-        ('protected_log', 'log'),
-        ('protected_sqrt', 'sqrt'),
-        ('protected_pow', 'pow'),
-        ('protected_exp', 'exp'),
-        ('protected_sin', 'sin'),
-        ('protected_cos', 'cos'),
-        ('protected_tan', 'tan'),
-        ('safe_add', 'add'),
-        ('safe_sub', 'sub'),
-        ('safe_mul', 'mul'),
-    ]
-    
-    result = expr_str
-    for old, new in replacements:
-        result = result.replace(old, new)
-    
-    return result
-
-
-def _parse_functional_to_infix(expr_str: str) -> str:
-    """
-    Recursively parse functional notation to infix notation.
-    
-    add(a, b) -> (a + b)
-    mul(a, b) -> (a * b)
-    sub(a, b) -> (a - b)
-    div(a, b) -> (a / b)
-    pow(a, b) -> (a ** b)
-    """
-    expr_str = expr_str.strip()
-    
-    # Binary operators
-    binary_ops = {
-        'add': '+',
-        'sub': '-',
-        'mul': '*',
-        'div': '/',
-        'pow': '**',
-    }
-    
-    # Unary functions (keep as-is for SymPy)
-    unary_funcs = {'sin', 'cos', 'tan', 'sqrt', 'log', 'exp', 'abs'}
-    
-    # Check if it's a function call
-    match = re.match(r'^(\w+)\((.*)\)$', expr_str)
-    
-    if not match:
-        # It's a terminal (variable or constant)
-        return expr_str
-    
-    func_name = match.group(1)
-    args_str = match.group(2)
-    
-    # Parse arguments (handle nested parentheses)
-    args = _split_arguments(args_str)
-    
-    if func_name in binary_ops and len(args) == 2:
-        # Binary operator
-        left = _parse_functional_to_infix(args[0])
-        right = _parse_functional_to_infix(args[1])
-        return f"({left} {binary_ops[func_name]} {right})"
-    
-    elif func_name in unary_funcs and len(args) == 1:
-        # Unary function
-        arg = _parse_functional_to_infix(args[0])
-        return f"{func_name}({arg})"
-    
-    else:
-        # Unknown function, try to handle generically
-        parsed_args = [_parse_functional_to_infix(arg) for arg in args]
-        return f"{func_name}({', '.join(parsed_args)})"
-
-
-def _split_arguments(args_str: str) -> list:
-    """
-    Split function arguments respecting nested parentheses.
-    
-    "a, b" -> ["a", "b"]
-    "add(x, y), z" -> ["add(x, y)", "z"]
+# Parsed and simplified expressions, keyed by the DEAP expression string;
+# shared by all runs since the same survivors are formatted again and again
+FORMAT_CACHE_SIZE = 4096
+_parse_cache: LRUCache = LRUCache(maxsize=FORMAT_CACHE_SIZE)
+_simplify_cache: LRUCache = LRUCache(maxsize=FORMAT_CACHE_SIZE)
+_display_cache: LRUCache = LRUCache(maxsize=FORMAT_CACHE_SIZE)
+
+# Largest expression (in SymPy operations) handed to simplify(). Its time
+# grows explosively with size - seconds to minutes, or memory exhaustion,
+# for trees of 15-20 nodes - and it cannot be interrupted from the worker
+# threads formatting runs on, so larger expressions are shown as parsed
+SIMPLIFY_MAX_OPS = 12
+
+
+# One token per match: a call opens a frame, ")" closes it, names and
+# numbers are terminals; anything else is a syntax error
+_TOKEN_RE = re.compile(r"""
+    (?P<call>[A-Za-z_]\w*)\(
+  | (?P<name>[A-Za-z_]\w*)
+  | (?P<number>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+  | (?P<close>\))
+  | (?P<comma>,)
+  | (?P<space>\s+)
+  | (?P<error>.)
+""", re.VERBOSE)
+
+# Protected/safe primitive names -> standard ones
+_FUNCTION_ALIASES = {
+    'protected_div': 'div',
+    'protected_log': 'log',
+    'protected_sqrt': 'sqrt',
+    'protected_pow': 'pow',
+    'protected_exp': 'exp',
+    'protected_sin': 'sin',
+    'protected_cos': 'cos',
+    'protected_tan': 'tan',
+    'safe_add': 'add',
+    'safe_sub': 'sub',
+    'safe_mul': 'mul',
+}
+
+# Binary operators
+_BINARY_OPS = {
+    'add': operator.add,
+    'sub': operator.sub,
+    'mul': operator.mul,
+    'div': operator.truediv,
+    'pow': operator.pow,
+}
+
+# Unary functions
+_UNARY_FUNCS = {
+    'sin': sp.sin, 'cos': sp.cos, 'tan': sp.tan,
+    'sqrt': sp.sqrt, 'log': sp.log, 'exp': sp.exp,
+    'abs': sp.Abs,
+}
+
+# DEAP argument names (ARG0...) and x0... display as x_0...
+_ARGUMENT_SYMBOLS = {}
+for _i in range(10):
+    _ARGUMENT_SYMBOLS[f'x{_i}'] = _ARGUMENT_SYMBOLS[f'ARG{_i}'] = symbols(f'x_{_i}')
+
+
+def _tokenize(expr_str: str) -> Iterator[Tuple[str, str]]:
     """
-    args = []
-    current = []
-    depth = 0
-    
-    for char in args_str:
-        if char == '(':
-            depth += 1
-            current.append(char)
-        elif char == ')':
-            depth -= 1
-            current.append(char)
-        elif char == ',' and depth == 0:
-            args.append(''.join(current).strip())
-            current = []
-        else:
-            current.append(char)
+    Split a DEAP expression into (kind, value) tokens in one regex pass.
     
-    if current:
-        args.append(''.join(current).strip())
-    
-    return args
-
-
-def _extract_variable_names(expr_str: str) -> set:
-    """
-    Extract variable names from a DEAP expression.
-
-    Returns set of variable names found in the expression.
+    "add(x, 2.5)" -> ("call", "add"), ("name", "x"), ("comma", ","),
+    ("number", "2.5"), ("close", ")")
     """
-    # Remove known function names and operators
-    known_funcs = {'add', 'sub', 'mul', 'div', 'pow', 'sin', 'cos', 'tan',
-                   'sqrt', 'log', 'exp', 'abs', 'protected_div', 'protected_log',
-                   'protected_sqrt', 'protected_pow', 'protected_exp',
-                   'protected_sin', 'protected_cos', 'protected_tan',
-                   'safe_add', 'safe_sub', 'safe_mul'}
-
-    # Find all word tokens
-    tokens = re.findall(r'\b([a-zA-Z_][a-zA-Z0-9_]*)\b', expr_str)
-
-    # Filter out functions
-    variables = set()
-    for token in tokens:
-        if token.lower() not in known_funcs:
-            variables.add(token)
-
-    return variables
-
-
+    for match in _TOKEN_RE.finditer(expr_str):
+        kind = match.lastgroup
+        if kind == 'space':
+            continue
+        if kind == 'error':
+            raise ValueError(f"Unexpected character {match.group()!r} at {match.start()}")
+        value = match.group(kind)
+        yield kind, value
+
+
+def _apply_function(name: str, args: List[sp.Expr]) -> sp.Expr:
+    """Build the SymPy node for a DEAP primitive call."""
+    name = _FUNCTION_ALIASES.get(name, name)
+    if name in _BINARY_OPS and len(args) == 2:
+        return _BINARY_OPS[name](args[0], args[1])
+    if name in _UNARY_FUNCS and len(args) == 1:
+        return _UNARY_FUNCS[name](args[0])
+    # Unknown function: keep it as an undefined SymPy function
+    return sp.Function(name)(*args)
+
+
+def _terminal(kind: str, value: str) -> sp.Expr:
+    """Build the SymPy node for a variable or constant."""
+    if kind == 'number':
+        if '.' in value or 'e' in value or 'E' in value:
+            return sp.Float(value)
+        return sp.Integer(value)
+    if value in _ARGUMENT_SYMBOLS:
+        return _ARGUMENT_SYMBOLS[value]
+    return sp.Symbol(value)
+
+
+@cached(_parse_cache, lock=threading.Lock())
 def deap_to_sympy(expr_str: str) -> Optional[sp.Expr]:
     """
     Convert a DEAP expression string to a SymPy expression.
 
+    Tokens are consumed once, left to right, on a stack of open calls: a
+    call pushes a frame, ")" pops it into a SymPy node appended to the
+    parent's arguments. No intermediate infix string is built. Results are
+    memoized (SymPy expressions are immutable).
+
     Args:
         expr_str: DEAP functional expression like "add(mul(x, 2), x)"
 
@@ -166,48 +137,65 @@ def deap_to_sympy(expr_str: str) -> Optional[sp.Expr]:
         SymPy expression or None if parsing fails
     """
     try:
-        # Clean up the expression
-        cleaned = _tokenize_deap_expr(expr_str)
+        # (function name, arguments) per open call; the bottom frame holds the result
+        frames: List[Tuple[Optional[str], List[sp.Expr]]] = [(None, [])]
 
-        # Convert functional to infix notation
-        infix = _parse_functional_to_infix(cleaned)
+        for kind, value in _tokenize(expr_str):
+            if kind == 'call':
+                frames.append((value, []))
+            elif kind == 'close':
+                if len(frames) == 1:
+                    raise ValueError("Unbalanced ')'")
+                name, args = frames.pop()
+                frames[-1][1].append(_apply_function(name, args))
+            elif kind != 'comma':
+                frames[-1][1].append(_terminal(kind, value))
 
-        # Parse with SymPy
-        # Define local symbols that might appear
-        local_dict = {
-            'x': x, 'y': y, 'z': z,
-            'sin': sp.sin, 'cos': sp.cos, 'tan': sp.tan,
-            'sqrt': sp.sqrt, 'log': sp.log, 'exp': sp.exp,
-            'abs': sp.Abs,
-        }
+        if len(frames) != 1 or len(frames[0][1]) != 1:
+            raise ValueError("Malformed expression")
 
-        # Add x0, x1, x2... as symbols
-        for i in range(10):
-            local_dict[f'x{i}'] = symbols(f'x_{i}')
-            local_dict[f'ARG{i}'] = symbols(f'x_{i}')
+        return frames[0][1][0]
 
-        # Dynamically add any variable names found in the expression
-        var_names = _extract_variable_names(expr_str)
-        for var_name in var_names:
-            if var_name not in local_dict:
-                local_dict[var_name] = symbols(var_name)
+    except Exception as e:
+        logger.warning(f"Failed to parse expression '{expr_str}': {e}")
+        return None
 
-        transformations = standard_transformations + (implicit_multiplication,)
 
-        sympy_expr = parse_expr(infix, local_dict=local_dict,
-                                transformations=transformations)
+def _simplify_within_budget(expr: sp.Expr) -> sp.Expr:
+    """
+    simplify() bounded by SIMPLIFY_MAX_OPS.
+    
+    Polynomials only need expanding, which is cheap at any size; other
+    expressions over the budget are returned unchanged.
+    """
+    if expr.is_polynomial():
+        return sp.expand(expr)
+    if sp.count_ops(expr) > SIMPLIFY_MAX_OPS:
+        return expr
+    return simplify(expr)
 
-        return sympy_expr
 
-    except Exception as e:
-        logger.warning(f"Failed to parse expression '{expr_str}': {e}")
-        return None
+def unformatted_equation(expr_str: str) -> Dict[str, Any]:
+    """
+    simplify_equation result for an expression that was not simplified.
+    
+    Same keys, with the raw expression everywhere and success False, so
+    clients fall back to showing the DEAP expression.
+    """
+    return {
+        "original": expr_str,
+        "simplified": expr_str,
+        "latex": expr_str,
+        "success": False
+    }
 
 
 def simplify_equation(expr_str: str) -> Dict[str, Any]:
     """
     Convert a DEAP expression to simplified form and LaTeX.
     
+    Results are memoized; each call returns a fresh dictionary.
+    
     Args:
         expr_str: DEAP functional expression
         
@@ -218,12 +206,18 @@ def simplify_equation(expr_str: str) -> Dict[str, Any]:
         - latex: LaTeX representation
         - success: Whether parsing succeeded
     """
-    result = {
-        "original": expr_str,
-        "simplified": expr_str,
-        "latex": expr_str,
-        "success": False
-    }
+    return dict(_simplify(expr_str))
+
+
+@cached(_simplify_cache, lock=threading.Lock())
+def _simplify(expr_str: str) -> Dict[str, Any]:
+    """Memoized simplify_equation; callers must not mutate the result."""
+    return _simplify_uncached(expr_str)
+
+
+def _simplify_uncached(expr_str: str) -> Dict[str, Any]:
+    """Uncached simplify_equation."""
+    result = unformatted_equation(expr_str)
     
     try:
         # Parse to SymPy
@@ -237,12 +231,13 @@ def simplify_equation(expr_str: str) -> Dict[str, Any]:
             # First try to rationalize floating point numbers
             simplified = nsimplify(sympy_expr, rational=False, tolerance=0.01)
             
-            # Then simplify algebraically
-            simplified = simplify(simplified)
+            # Then simplify algebraically, within the size budget
+            simplified = _simplify_within_budget(simplified)
             
-            # Try factoring if it makes it simpler
+            # Try factoring if it makes it simpler (by simplify()'s own
+            # measure, without printing either form)
             factored = factor(simplified)
-            if len(str(factored)) < len(str(simplified)):
+            if sp.count_ops(factored) < sp.count_ops(simplified):
                 simplified = factored
                 
         except Exception:
@@ -277,16 +272,17 @@ def _clean_latex(latex_str: str) -> str:
     return latex_str
 
 
+@cached(_display_cache, lock=threading.Lock())
 def format_for_display(expr_str: str) -> str:
     """
     Format equation for simple text display (no LaTeX).
     
-    Converts DEAP functional notation to readable infix.
+    Converts DEAP functional notation to readable infix. Results are memoized.
     """
     try:
         sympy_expr = deap_to_sympy(expr_str)
         if sympy_expr is not None:
-            simplified = simplify(sympy_expr)
+            simplified = _simplify_within_budget(sympy_expr)
             return str(simplified)
     except Exception:
         pass
@@ -295,20 +291,20 @@ def format_for_display(expr_str: str) -> str:
     return _basic_format(expr_str)
 
 
+# Binary operator calls -> bare parentheses; protected_/safe_ prefixes -> ''
+_BASIC_FORMAT_RE = re.compile(r'(?:add|sub|mul|div)\(|protected_|safe_')
+
+
+def _basic_format_replacement(match: re.Match) -> str:
+    """Replacement text for a _BASIC_FORMAT_RE match."""
+    return '(' if match.group().endswith('(') else ''
+
+
 def _basic_format(expr_str: str) -> str:
     """
     Basic formatting without SymPy (fallback).
+    
+    Drops the binary operator names (keeping their parentheses) and the
+    protected_/safe_ prefixes in one pass.
     """
-    result = expr_str
-    replacements = [
-        ('add(', '('),
-        ('sub(', '('),
-        ('mul(', '('),
-        ('div(', '('),
-        ('protected_', ''),
-        ('safe_', ''),
-    ]
-    for old, new in replacements:
-        result = result.replace(old, new)
-    return result
-
+    return _BASIC_FORMAT_RE.sub(_basic_format_replacement, expr_str)
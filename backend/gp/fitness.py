@@ -1,7 +1,12 @@
 """Fitness functions and evaluation metrics for GP with NumPy vectorization."""
 import numpy as np
-from typing import Tuple
+from typing import Any, Dict, Optional, Tuple
 import warnings
+import weakref
+
+from cachetools import LRUCache
+
+from .interpreter import compile_postfix, predict_postfix, to_columns, tree_key
 
 # Suppress numpy warnings for cleaner output
 warnings.filterwarnings('ignore', category=RuntimeWarning)
@@ -10,8 +15,8 @@ warnings.filterwarnings('ignore', category=RuntimeWarning)
 def calculate_mse(y_true: np.ndarray, y_pred: np.ndarray) -> float:
     """Calculate Mean Squared Error with proper handling of invalid values."""
     try:
-        y_true = np.asarray(y_true, dtype=np.float64).flatten()
-        y_pred = np.asarray(y_pred, dtype=np.float64).flatten()
+        y_true = np.asarray(y_true, dtype=np.float64).ravel()
+        y_pred = np.asarray(y_pred, dtype=np.float64).ravel()
         
         # Handle invalid values
         mask = np.isfinite(y_pred)
@@ -37,8 +42,8 @@ def calculate_mse(y_true: np.ndarray, y_pred: np.ndarray) -> float:
 def calculate_r_squared(y_true: np.ndarray, y_pred: np.ndarray) -> float:
     """Calculate R-squared (coefficient of determination)."""
     try:
-        y_true = np.asarray(y_true, dtype=np.float64).flatten()
-        y_pred = np.asarray(y_pred, dtype=np.float64).flatten()
+        y_true = np.asarray(y_true, dtype=np.float64).ravel()
+        y_pred = np.asarray(y_pred, dtype=np.float64).ravel()
         
         # Handle invalid values
         mask = np.isfinite(y_pred) & np.isfinite(y_true)
@@ -96,20 +101,118 @@ def calculate_parsimony_score(r_squared: float, complexity: int, alpha: float =
     return r_squared - alpha * complexity
 
 
+def calculate_total_sum_of_squares(y: np.ndarray) -> float:
+    """Calculate the total sum of squares of y, the R² denominator."""
+    y = np.asarray(y, dtype=np.float64).ravel()
+    centered = y - y.mean()
+    return float(np.dot(centered, centered))
+
+
+def calculate_all_metrics(
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    complexity: int,
+    ss_tot: Optional[float] = None,
+    alpha: float = 0.01
+) -> Dict[str, float]:
+    """
+    Calculate MSE, R², AIC, BIC and parsimony score from one residual pass.
+    
+    Gives the same values as the individual calculate_* functions. The
+    residuals are reduced once; non-finite predictions fall back to the
+    individual functions.
+    
+    Args:
+        y_true: Targets
+        y_pred: Predictions
+        complexity: Tree size
+        ss_tot: calculate_total_sum_of_squares(y_true), if already known
+        alpha: Parsimony weight
+        
+    Returns:
+        Dict with mse, r_squared, aic, bic and parsimony_score
+    """
+    y_true = np.asarray(y_true, dtype=np.float64).ravel()
+    y_pred = np.asarray(y_pred, dtype=np.float64).ravel()
+    n_samples = len(y_true)
+    
+    residuals = y_true - y_pred
+    ss_res = float(np.dot(residuals, residuals))
+    if n_samples < 2 or not np.isfinite(ss_res):
+        mse = calculate_mse(y_true, y_pred)
+        r_squared = calculate_r_squared(y_true, y_pred)
+    else:
+        mse = ss_res / n_samples
+        if ss_tot is None:
+            ss_tot = calculate_total_sum_of_squares(y_true)
+        if ss_tot < 1e-10:
+            r_squared = 1.0 if ss_res < 1e-10 else 0.0
+        else:
+            r_squared = float(np.clip(1.0 - ss_res / ss_tot, 0.0, 1.0))
+    
+    return {
+        "mse": mse,
+        "r_squared": r_squared,
+        "aic": calculate_aic(mse, n_samples, complexity),
+        "bic": calculate_bic(mse, n_samples, complexity),
+        "parsimony_score": calculate_parsimony_score(r_squared, complexity, alpha=alpha),
+    }
+
+
+# gp.compile results of the scalar path, per primitive set, keyed by tree_key(individual)
+COMPILE_CACHE_SIZE = 4096
+_compiled: "weakref.WeakKeyDictionary[Any, LRUCache]" = weakref.WeakKeyDictionary()
+
+
+def _compile_cached(individual, toolbox, pset):
+    """toolbox.compile, memoized per primitive set by tree structure (uncached without a pset)."""
+    if pset is None:
+        return toolbox.compile(expr=individual)
+    
+    cache = _compiled.get(pset)
+    if cache is None:
+        cache = _compiled.setdefault(pset, LRUCache(maxsize=COMPILE_CACHE_SIZE))
+    key = tree_key(individual)
+    func = cache.get(key)
+    if func is None:
+        func = toolbox.compile(expr=individual)
+        cache[key] = func
+    return func
+
+
 def get_predictions_vectorized(individual, toolbox, X: np.ndarray) -> np.ndarray:
     """
     Get predictions from an individual using vectorized NumPy operations.
     
-    This is the optimized version that uses np.vectorize for faster evaluation.
+    Trees over the standard primitives run once over whole columns with the
+    postfix interpreter (one NumPy call per node). Trees it cannot compile
+    fall back to evaluating the DEAP-compiled function per sample.
     """
     try:
-        # Compile the individual to a function
-        func = toolbox.compile(expr=individual)
-        
-        X = np.asarray(X, dtype=np.float64)
+        # Keep float32/float64 input as-is; only non-float data is converted
+        X = np.asarray(X)
+        if not np.issubdtype(X.dtype, np.floating):
+            X = X.astype(np.float64)
         if X.ndim == 1:
             X = X.reshape(-1, 1)
         
+        # One contiguous array per variable, shared by both paths
+        columns = to_columns(X)
+        
+        # toolbox.compile is gp.compile with the primitive set bound
+        pset = getattr(toolbox.compile, "keywords", {}).get("pset")
+        if pset is not None:
+            try:
+                arg_index = {name: i for i, name in enumerate(pset.arguments)}
+                code, consts = compile_postfix(individual, arg_index)
+            except Exception:
+                pass
+            else:
+                return predict_postfix(code, consts, columns, X.shape[0])
+        
+        # Compile the individual to a function
+        func = _compile_cached(individual, toolbox, pset)
+        
         n_samples = X.shape[0]
         n_features = X.shape[1]
         
@@ -118,14 +221,14 @@ def get_predictions_vectorized(individual, toolbox, X: np.ndarray) -> np.ndarray
             # Use np.vectorize for scalar functions
             vectorized_func = np.vectorize(func, otypes=[np.float64])
             try:
-                predictions = vectorized_func(X[:, 0])
+                predictions = vectorized_func(columns[0])
             except Exception:
                 # Fallback to loop if vectorize fails
-                predictions = np.array([_safe_eval(func, row[0]) for row in X])
+                predictions = np.array([_safe_eval(func, x) for x in columns[0]])
         else:
-            # Multi-variable: evaluate row by row with unpacking
+            # Multi-variable: walk the columns in step rather than slicing rows
             predictions = np.array([
-                _safe_eval_multi(func, row) for row in X
+                _safe_eval_multi(func, args) for args in zip(*columns)
             ])
         
         # Clean up predictions
@@ -179,7 +282,7 @@ def evaluate_individual_vectorized(
         predictions = get_predictions_vectorized(individual, toolbox, X)
         
         # Calculate MSE
-        y = np.asarray(y, dtype=np.float64).flatten()
+        y = np.asarray(y, dtype=np.float64).ravel()
         mse = calculate_mse(y, predictions)
         
         # Add parsimony pressure (penalize complexity)
@@ -221,27 +324,36 @@ def evaluate_on_split(
     X_test: np.ndarray,
     y_test: np.ndarray
 ) -> dict:
-    """Evaluate an individual on both train and test sets."""
+    """
+    Evaluate an individual on both train and test sets.
+    
+    The tree runs once over the stacked train and test rows; each split's
+    metrics then come from a single residual reduction.
+    """
     complexity = len(individual)
     n_train = len(y_train)
     n_test = len(y_test)
     
-    # Train metrics
-    pred_train = get_predictions_vectorized(individual, toolbox, X_train)
-    mse_train = calculate_mse(y_train, pred_train)
-    r2_train = calculate_r_squared(y_train, pred_train)
-    
-    # Test metrics
-    pred_test = get_predictions_vectorized(individual, toolbox, X_test)
-    mse_test = calculate_mse(y_test, pred_test)
-    r2_test = calculate_r_squared(y_test, pred_test)
+    X_train = np.asarray(X_train).reshape(n_train, -1)
+    # The feature count comes from the train rows: -1 cannot be inferred
+    # for an empty test split
+    X_all = np.concatenate([
+        X_train,
+        np.asarray(X_test).reshape(n_test, X_train.shape[1]),
+    ])
+    predictions = get_predictions_vectorized(individual, toolbox, X_all)
     
-    # Information criteria (on test set)
-    aic = calculate_aic(mse_test, n_test, complexity)
-    bic = calculate_bic(mse_test, n_test, complexity)
+    train_metrics = calculate_all_metrics(y_train, predictions[:n_train], complexity)
+    mse_train = train_metrics["mse"]
+    r2_train = train_metrics["r_squared"]
     
-    # Parsimony score (on test set)
-    parsimony_score = calculate_parsimony_score(r2_test, complexity)
+    # Information criteria and parsimony score are reported on the test set
+    test_metrics = calculate_all_metrics(y_test, predictions[n_train:], complexity)
+    mse_test = test_metrics["mse"]
+    r2_test = test_metrics["r_squared"]
+    aic = test_metrics["aic"]
+    bic = test_metrics["bic"]
+    parsimony_score = test_metrics["parsimony_score"]
     
     # Overfitting indicator
     overfit_gap = r2_train - r2_test
@@ -0,0 +1,335 @@
+"""
+Postfix bytecode interpreter for evaluating GP trees over whole arrays.
+
+Each tree is compiled once into a flat list of integer opcodes. Evaluation
+runs the program on a value stack where every entry is a full column of
+samples, so each node costs one NumPy operation instead of one Python call
+per sample. The floating-point error state is set once per program or batch
+rather than once per node.
+"""
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from deap import gp
+
+from .primitives import VECTORIZED_PRIMITIVES
+
+UNARY_PRIMITIVES = frozenset({"sin", "cos", "tan", "sqrt", "log", "exp", "abs"})
+
+# Opcodes: primitives are indices into OPCODE_TABLE, variables and constants
+# are offset by VAR_BASE/CONST_BASE
+OPCODE_TABLE: Tuple[Tuple[str, object, int], ...] = tuple(
+    (name, func, 1 if name in UNARY_PRIMITIVES else 2)
+    for name, func in VECTORIZED_PRIMITIVES.items()
+)
+OPCODES: Dict[str, int] = {name: code for code, (name, _, _) in enumerate(OPCODE_TABLE)}
+VAR_BASE = 100
+CONST_BASE = 1 << 20
+
+# Opcode -> takes one operand (lookup table for the compiled kernels)
+UNARY_OPCODES = np.zeros(VAR_BASE, dtype=np.bool_)
+UNARY_OPCODES[[code for code, (_, _, arity) in enumerate(OPCODE_TABLE) if arity == 1]] = True
+
+OP_ADD = OPCODES["add"]
+OP_SUB = OPCODES["sub"]
+OP_MUL = OPCODES["mul"]
+OP_DIV = OPCODES["div"]
+OP_POW = OPCODES["pow"]
+OP_SIN = OPCODES["sin"]
+OP_COS = OPCODES["cos"]
+OP_TAN = OPCODES["tan"]
+OP_SQRT = OPCODES["sqrt"]
+OP_LOG = OPCODES["log"]
+OP_EXP = OPCODES["exp"]
+OP_ABS = OPCODES["abs"]
+
+
+def check_primitive_set(pset: gp.PrimitiveSet):
+    """
+    Check that every primitive of a set maps to an opcode of the same arity.
+    
+    Run once at engine construction so an unsupported primitive fails there
+    instead of in the middle of evolution.
+    
+    Args:
+        pset: DEAP primitive set to check
+        
+    Raises:
+        ValueError: A primitive has no opcode or a different arity, or there
+            are more variables than variable opcodes
+    """
+    for primitives in pset.primitives.values():
+        for primitive in primitives:
+            code = OPCODES.get(primitive.name)
+            if code is None:
+                raise ValueError(f"Primitive '{primitive.name}' is not supported by the interpreter")
+            if OPCODE_TABLE[code][2] != primitive.arity:
+                raise ValueError(
+                    f"Primitive '{primitive.name}' has arity {primitive.arity}, "
+                    f"interpreter expects {OPCODE_TABLE[code][2]}"
+                )
+    if len(pset.arguments) > CONST_BASE - VAR_BASE:
+        raise ValueError(f"Too many variables for the interpreter: {len(pset.arguments)}")
+
+
+def compile_postfix(individual, arg_index: Dict[str, int]) -> Tuple[List[int], List[float]]:
+    """
+    Compile a DEAP tree to postfix bytecode.
+    
+    DEAP stores trees in prefix order; the reversed prefix sequence is a
+    valid postfix program whose operands come off the stack in argument order.
+    
+    Args:
+        individual: DEAP PrimitiveTree
+        arg_index: Variable name to column index (pset.arguments order)
+        
+    Returns:
+        code: Opcodes
+        consts: Constant values referenced by CONST_BASE + k opcodes
+    """
+    code = []
+    consts = []
+    for node in reversed(individual):
+        if isinstance(node, gp.Primitive):
+            code.append(OPCODES[node.name])
+        elif isinstance(node.value, str):
+            code.append(VAR_BASE + arg_index[node.value])
+        else:
+            code.append(CONST_BASE + len(consts))
+            consts.append(float(node.value))
+    return code, consts
+
+
+def tree_key(individual) -> Tuple:
+    """
+    Hashable key identifying a tree's structure, for caches.
+    
+    The prefix sequence of primitive names and terminal values (variable
+    names or constants) determines the tree, since DEAP names are unique
+    within a primitive set. About 8x cheaper than str(individual), and a
+    tuple compares by value, so unlike a bare hash it can never collide.
+    """
+    return tuple([node.name if node.arity else node.value for node in individual])
+
+
+def eval_postfix(
+    code: Sequence[int],
+    consts: Sequence[float],
+    columns: Sequence[np.ndarray],
+    n_samples: int
+) -> np.ndarray:
+    """
+    Run a postfix program over column arrays.
+    
+    Args:
+        code: Opcodes from compile_postfix
+        consts: Constants from compile_postfix
+        columns: One 1-D array per variable
+        n_samples: Length of the columns (for constant-only programs)
+        
+    Returns:
+        Raw predictions, shape (n_samples,)
+    """
+    with np.errstate(all='ignore'):
+        return _execute(code, consts, columns, n_samples)
+
+
+def predict_postfix(
+    code: Sequence[int],
+    consts: Sequence[float],
+    columns: Sequence[np.ndarray],
+    n_samples: int
+) -> np.ndarray:
+    """
+    Run a postfix program and clean up its output like get_predictions_vectorized:
+    non-finite predictions become 0 and values are clipped to +-1e10.
+    """
+    with np.errstate(all='ignore'):
+        return _predict(code, consts, columns, n_samples)
+
+
+def _execute(code, consts, columns, n_samples) -> np.ndarray:
+    """eval_postfix body; the caller sets the floating-point error state once per batch."""
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    for op in code:
+        if op >= CONST_BASE:
+            push(consts[op - CONST_BASE])
+        elif op >= VAR_BASE:
+            push(columns[op - VAR_BASE])
+        else:
+            _, func, arity = OPCODE_TABLE[op]
+            if arity == 2:
+                first = pop()
+                push(func(first, pop()))
+            else:
+                push(func(pop()))
+    return np.broadcast_to(stack[0], (n_samples,))
+
+
+def _predict(code, consts, columns, n_samples) -> np.ndarray:
+    """predict_postfix body; the caller sets the floating-point error state once per batch."""
+    try:
+        predictions = _execute(code, consts, columns, n_samples)
+        predictions = np.where(np.isfinite(predictions), predictions, 0.0)
+        return np.clip(predictions, -1e10, 1e10)
+    except Exception:
+        return np.zeros(n_samples)
+
+
+def to_columns(X: np.ndarray) -> np.ndarray:
+    """
+    Transpose samples into one contiguous float column per variable.
+    
+    Columns of a row-major matrix are strided views; copying them once lets
+    every program run on contiguous memory. The result is a single
+    (n_variables, n_samples) array in the data's float dtype, so the compiled
+    kernels take it as is, without stacking the columns per batch.
+    
+    Args:
+        X: Samples, shape (n_samples, n_variables) or (n_samples,)
+        
+    Returns:
+        Array whose rows are the variables' columns, in variable order
+    """
+    X = np.asarray(X)
+    if not np.issubdtype(X.dtype, np.floating):
+        X = X.astype(np.float64)
+    if X.ndim == 1:
+        X = X.reshape(-1, 1)
+    return np.ascontiguousarray(X.T)
+
+
+def get_predictions_postfix(
+    individual,
+    arg_index: Dict[str, int],
+    columns: Sequence[np.ndarray],
+    n_samples: int
+) -> np.ndarray:
+    """Get predictions for an individual over to_columns output with the postfix interpreter."""
+    try:
+        code, consts = compile_postfix(individual, arg_index)
+    except Exception:
+        return np.zeros(n_samples)
+    return predict_postfix(code, consts, columns, n_samples)
+
+
+# ============================================
+# Element primitives for the compiled kernels
+# ============================================
+
+# Plain Python on scalars, compiled by jit_interpreter (CPU) and
+# cuda_interpreter (device functions); same results as the np_* primitives
+
+def apply_binary(op, a, b):
+    """Element version of the np_* binary primitives (a is the first argument)."""
+    if op == OP_ADD:
+        result = a + b
+        return result if math.isfinite(result) else 0.0
+    if op == OP_SUB:
+        result = a - b
+        return result if math.isfinite(result) else 0.0
+    if op == OP_MUL:
+        result = a * b
+        return result if math.isfinite(result) and abs(result) <= 1e10 else 0.0
+    if op == OP_DIV:
+        if abs(b) < 1e-10:
+            return 1.0
+        result = a / b
+        return result if math.isfinite(result) else 1.0
+    # OP_POW
+    result = math.pow(abs(a) + 1e-10, min(max(b, -5.0), 5.0))
+    return result if math.isfinite(result) and abs(result) <= 1e10 else 1.0
+
+
+def apply_unary(op, x):
+    """Element version of the np_* unary primitives."""
+    if op == OP_ABS:
+        return abs(x)
+    if op == OP_LOG:
+        if not x > 0:
+            return 0.0
+        result = math.log(x)
+    elif op == OP_EXP:
+        result = math.exp(min(max(x, -30.0), 30.0))
+        return result if math.isfinite(result) else 1.0
+    elif op == OP_SQRT:
+        result = math.sqrt(abs(x))
+    elif not math.isfinite(x):
+        # Trig of inf/nan is nan (math raises instead of returning it)
+        return 0.0
+    elif op == OP_TAN:
+        result = math.tan(x)
+        return result if math.isfinite(result) and abs(result) <= 1e10 else 0.0
+    elif op == OP_SIN:
+        result = math.sin(x)
+    else:  # OP_COS
+        result = math.cos(x)
+    return result if math.isfinite(result) else 0.0
+
+
+def batch_mse(
+    programs: Sequence[Tuple[List[int], List[float]]],
+    columns: Sequence[np.ndarray],
+    y: np.ndarray
+) -> np.ndarray:
+    """
+    Mean squared error of each program's predictions.
+    
+    Predictions are stacked into one (programs, samples) matrix so the error
+    is reduced for the whole batch at once. With numba installed the batch
+    runs in the compiled kernel of jit_interpreter instead.
+    
+    Args:
+        programs: (code, consts) pairs from compile_postfix
+        columns: Sample columns from to_columns
+        y: Targets, shape (n_samples,)
+        
+    Returns:
+        MSE per program
+    """
+    if jit_batch_mse is not None:
+        return jit_batch_mse(programs, columns, y)
+
+    n_samples = len(y)
+    # Predictions stay in the data dtype; errors are reduced in float64
+    dtype = columns[0].dtype if len(columns) else np.float64
+    predictions = np.empty((len(programs), n_samples), dtype=dtype)
+    with np.errstate(all='ignore'):
+        for row, (code, consts) in zip(predictions, programs):
+            row[:] = _predict(code, consts, columns, n_samples)
+    
+    errors = predictions - y
+    return np.einsum('ij,ij->i', errors, errors, dtype=np.float64) / n_samples
+
+
+# ============================================
+# Worker processes
+# ============================================
+
+# Training data of the engine a worker process serves (set by init_worker)
+_worker_data: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+
+def init_worker(columns: Sequence[np.ndarray], y: np.ndarray):
+    """Process pool initializer: keep the training data for batch_mse_worker."""
+    global _worker_data
+    _worker_data = (columns, y)
+    # The pool already uses every core
+    if use_single_thread is not None:
+        use_single_thread()
+
+
+def batch_mse_worker(programs: Sequence[Tuple[List[int], List[float]]]) -> np.ndarray:
+    """batch_mse against the training data given to init_worker."""
+    return batch_mse(programs, *_worker_data)
+
+
+# Compiled batch kernel; imported last since it reads the opcodes above
+try:
+    from .jit_interpreter import jit_batch_mse, use_single_thread
+except ImportError:
+    jit_batch_mse = None
+    use_single_thread = None
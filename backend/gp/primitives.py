@@ -12,140 +12,183 @@ logger = logging.getLogger(__name__)
 
 # ============================================
 # Protected Operations (Scalar versions)
-# These handle edge cases to prevent NaN/Inf
+# These handle edge cases to prevent NaN/Inf.
+# Float arithmetic cannot raise here, so only the
+# math calls that can (overflowing pow, trig of
+# infinity) are guarded.
 # ============================================
 
 def protected_div(left, right):
     """Protected division - returns 1.0 when dividing by near-zero."""
-    try:
-        if abs(right) < 1e-10:
-            return 1.0
-        result = left / right
-        if math.isinf(result) or math.isnan(result):
-            return 1.0
-        return result
-    except:
+    if abs(right) < 1e-10:
         return 1.0
+    result = left / right
+    return result if math.isfinite(result) else 1.0
 
 
 def protected_log(x):
     """Protected natural logarithm - handles non-positive values."""
-    try:
-        if x <= 0:
-            return 0.0
-        result = math.log(x)
-        if math.isinf(result) or math.isnan(result):
-            return 0.0
-        return result
-    except:
+    if not x > 0:
         return 0.0
+    result = math.log(x)
+    return result if math.isfinite(result) else 0.0
 
 
 def protected_sqrt(x):
     """Protected square root - uses absolute value."""
-    try:
-        result = math.sqrt(abs(x))
-        if math.isinf(result) or math.isnan(result):
-            return 0.0
-        return result
-    except:
-        return 0.0
+    result = math.sqrt(abs(x))
+    return result if math.isfinite(result) else 0.0
 
 
 def protected_pow(base, exp):
     """Protected power function - clamps exponent and handles edge cases."""
+    # Clamp exponent to reasonable range; abs(base) avoids complex numbers
     try:
-        # Clamp exponent to reasonable range
-        exp = max(-5, min(5, exp))
-        
-        # Use abs(base) to avoid complex numbers
-        abs_base = abs(base) + 1e-10
-        result = math.pow(abs_base, exp)
-        
-        if math.isinf(result) or math.isnan(result) or abs(result) > 1e10:
-            return 1.0
-        return result
-    except:
+        result = math.pow(abs(base) + 1e-10, max(-5, min(5, exp)))
+    except OverflowError:
         return 1.0
+    return result if math.isfinite(result) and abs(result) <= 1e10 else 1.0
 
 
 def protected_exp(x):
     """Protected exponential - clamps input to avoid overflow."""
-    try:
-        # Clamp input to prevent overflow
-        x_clamped = max(-30, min(30, x))
-        result = math.exp(x_clamped)
-        if math.isinf(result) or math.isnan(result):
-            return 1.0
-        return result
-    except:
-        return 1.0
+    # exp(30) is finite, and NaN clamps to 30 as well
+    return math.exp(max(-30, min(30, x)))
 
 
 def protected_tan(x):
     """Protected tangent - handles asymptotes."""
     try:
         result = math.tan(x)
-        if math.isinf(result) or math.isnan(result) or abs(result) > 1e10:
-            return 0.0
-        return result
-    except:
+    except ValueError:
         return 0.0
+    return result if math.isfinite(result) and abs(result) <= 1e10 else 0.0
 
 
 def protected_sin(x):
     """Protected sine."""
     try:
         result = math.sin(x)
-        if math.isnan(result):
-            return 0.0
-        return result
-    except:
+    except ValueError:
         return 0.0
+    return result if result == result else 0.0
 
 
 def protected_cos(x):
     """Protected cosine."""
     try:
         result = math.cos(x)
-        if math.isnan(result):
-            return 0.0
-        return result
-    except:
+    except ValueError:
         return 0.0
+    return result if result == result else 0.0
 
 
 def safe_add(a, b):
     """Safe addition with overflow protection."""
-    try:
-        result = a + b
-        if math.isinf(result) or math.isnan(result):
-            return 0.0
-        return result
-    except:
-        return 0.0
+    result = a + b
+    return result if math.isfinite(result) else 0.0
 
 
 def safe_sub(a, b):
     """Safe subtraction with overflow protection."""
-    try:
-        result = a - b
-        if math.isinf(result) or math.isnan(result):
-            return 0.0
-        return result
-    except:
-        return 0.0
+    result = a - b
+    return result if math.isfinite(result) else 0.0
 
 
 def safe_mul(a, b):
     """Safe multiplication with overflow protection."""
-    try:
-        result = a * b
-        if math.isinf(result) or math.isnan(result) or abs(result) > 1e10:
-            return 0.0
+    result = a * b
+    return result if math.isfinite(result) and abs(result) <= 1e10 else 0.0
+
+
+# ============================================
+# Protected Operations (Array versions)
+# Elementwise equivalents of the scalar versions above,
+# used by the postfix interpreter. They do not touch the
+# floating-point error state: callers evaluate whole
+# programs under np.errstate(all='ignore').
+# ============================================
+
+def _replace(result, mask, fallback):
+    """
+    Set result to fallback where mask is true.
+    
+    result is always a fresh ufunc output, so arrays are patched in place
+    instead of allocating another array; NumPy scalars (subtrees of only
+    constants) go through np.where.
+    """
+    if isinstance(result, np.ndarray) and result.ndim:
+        np.copyto(result, fallback, where=mask)
         return result
-    except:
-        return 0.0
+    return np.where(mask, fallback, result)
+
+
+def _finite_or(result, fallback):
+    """Replace non-finite entries of result with fallback."""
+    return _replace(result, ~np.isfinite(result), fallback)
+
+
+def _bounded_or(result, fallback):
+    """Replace entries of result that are non-finite or above 1e10 in magnitude with fallback."""
+    # NaN fails the comparison too
+    return _replace(result, ~(np.abs(result) <= 1e10), fallback)
+
+
+def np_protected_div(left, right):
+    """Protected division - 1.0 where the divisor is near zero or the result is not finite."""
+    result = np.divide(left, right)
+    return _replace(result, ~np.isfinite(result) | (np.abs(right) < 1e-10), 1.0)
+
+
+def np_protected_log(x):
+    """Protected natural logarithm - 0.0 for non-positive values."""
+    # log(1.0) is exactly 0.0
+    return _finite_or(np.log(np.where(x > 0, x, 1.0)), 0.0)
+
+
+def np_protected_sqrt(x):
+    """Protected square root - uses absolute value."""
+    return _finite_or(np.sqrt(np.abs(x)), 0.0)
+
+
+def np_protected_pow(base, exp):
+    """Protected power function - clamped exponent, 1.0 on overflow."""
+    return _bounded_or(np.power(np.abs(base) + 1e-10, np.clip(exp, -5, 5)), 1.0)
+
+
+def np_protected_exp(x):
+    """Protected exponential - clamps input to avoid overflow."""
+    return _finite_or(np.exp(np.clip(x, -30, 30)), 1.0)
+
+
+def np_protected_tan(x):
+    """Protected tangent - 0.0 near asymptotes."""
+    return _bounded_or(np.tan(x), 0.0)
+
+
+def np_protected_sin(x):
+    """Protected sine."""
+    return _finite_or(np.sin(x), 0.0)
+
+
+def np_protected_cos(x):
+    """Protected cosine."""
+    return _finite_or(np.cos(x), 0.0)
+
+
+def np_safe_add(a, b):
+    """Safe addition with overflow protection."""
+    return _finite_or(np.add(a, b), 0.0)
+
+
+def np_safe_sub(a, b):
+    """Safe subtraction with overflow protection."""
+    return _finite_or(np.subtract(a, b), 0.0)
+
+
+def np_safe_mul(a, b):
+    """Safe multiplication with overflow protection."""
+    return _bounded_or(np.multiply(a, b), 0.0)
 
 
 # ============================================
@@ -180,6 +223,23 @@ FUNCTION_MAP = {
 }
 
 
+# Array versions, keyed by primitive name
+VECTORIZED_PRIMITIVES = {
+    "add": np_safe_add,
+    "sub": np_safe_sub,
+    "mul": np_safe_mul,
+    "div": np_protected_div,
+    "pow": np_protected_pow,
+    "sin": np_protected_sin,
+    "cos": np_protected_cos,
+    "tan": np_protected_tan,
+    "sqrt": np_protected_sqrt,
+    "log": np_protected_log,
+    "exp": np_protected_exp,
+    "abs": np.abs,
+}
+
+
 # ============================================
 # Primitive Set Creation
 # ============================================
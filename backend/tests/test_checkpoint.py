@@ -0,0 +1,110 @@
+"""Tests for saving and loading checkpoints of a real engine."""
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from gp.checkpoint import CODEC_ZSTD_DELTA, CheckpointManager, _read_state, _write_state
+from gp.engine import GPEngine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """Engine stopped after its first generation update."""
+    rng = np.random.default_rng(0)
+    X = rng.uniform(-5, 5, size=(100, 2))
+    y = X[:, 0] ** 2 + X[:, 1]
+    engine = GPEngine(
+        X=X, y=y, variable_names=["a", "b"],
+        population_size=40, update_interval=0.0, n_workers=1
+    )
+
+    async def stop_on_update(update):
+        engine.stop()
+
+    asyncio.run(engine.evolve(callback=stop_on_update))
+    return engine
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return CheckpointManager(tmp_path)
+
+
+def test_round_trip(engine, manager):
+    state = engine.get_checkpoint_state()
+    checkpoint_id = manager.save_checkpoint("session", state, "first")
+    manager.flush()
+
+    loaded = manager.load_checkpoint(checkpoint_id)
+    assert loaded["generation"] == state["generation"] > 0
+    assert [str(ind) for ind in loaded["population"]] == [str(ind) for ind in state["population"]]
+    assert [ind.fitness.values for ind in loaded["population"]] == [
+        ind.fitness.values for ind in state["population"]
+    ]
+    assert [str(ind) for ind in loaded["hall_of_fame"]] == [str(ind) for ind in state["hall_of_fame"]]
+    assert loaded["generation_stats"] == state["generation_stats"]
+    assert loaded["config"] == state["config"]
+    assert loaded["data_info"] == state["data_info"]
+
+    engine.restore_from_checkpoint(loaded)
+    assert engine.current_generation == state["generation"]
+
+
+def test_unchanged_state_is_listed_and_survives_restart(engine, manager):
+    state = engine.get_checkpoint_state()
+    first = manager.save_checkpoint("session", state, "first")
+    second = manager.save_checkpoint("session", state, "second")
+    manager.flush()
+
+    listed = {cp["checkpoint_id"]: cp["name"] for cp in manager.list_checkpoints("session")}
+    assert listed == {first: "first", second: "second"}
+
+    reopened = CheckpointManager(manager.checkpoint_dir)
+    assert reopened.delete_checkpoint(first)
+    reopened.flush()
+    assert reopened.load_checkpoint(second)["generation"] == state["generation"]
+    assert reopened.get_metadata(second)["name"] == "second"
+
+
+def test_failed_write_is_reported(manager):
+    checkpoint_id = manager.save_checkpoint("session", {"population": [lambda: None]})
+    manager.flush()
+    with pytest.raises(RuntimeError, match="failed to save"):
+        manager.load_checkpoint(checkpoint_id)
+
+
+def test_write_state_defaults(tmp_path):
+    path = tmp_path / "state.ckpt"
+    state = {"generation": 3, "values": np.arange(10.0)}
+    with open(path, "wb") as f:
+        _write_state(f, state)
+
+    loaded = _read_state(path)
+    assert loaded["generation"] == 3
+    np.testing.assert_array_equal(loaded["values"], state["values"])
+
+
+def test_write_state_delta_needs_base(tmp_path):
+    with open(tmp_path / "state.ckpt", "wb") as f:
+        with pytest.raises(ValueError, match="base_for"):
+            _write_state(f, {}, CODEC_ZSTD_DELTA)
+
+
+def test_reads_wait_only_for_their_checkpoint(manager, monkeypatch):
+    release = threading.Event()
+    write = manager._write_checkpoint
+
+    def blocked_write(checkpoint_id, session_id, *args):
+        if session_id == "slow":
+            release.wait()
+        write(checkpoint_id, session_id, *args)
+
+    monkeypatch.setattr(manager, "_write_checkpoint", blocked_write)
+    slow = manager.save_checkpoint("slow", {"generation": 1})
+    assert manager.list_checkpoints() == []
+
+    release.set()
+    assert manager.load_checkpoint(slow)["generation"] == 1
+    assert [cp["checkpoint_id"] for cp in manager.list_checkpoints()] == [slow]
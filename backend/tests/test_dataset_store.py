@@ -0,0 +1,20 @@
+"""Tests for the Parquet-backed dataset store."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from api.dataset_store import DatasetStore
+
+
+def test_concurrent_saves(tmp_path):
+    store = DatasetStore(tmp_path)
+    frames = [pd.DataFrame({"a": range(100 + i), "b": float(i)}) for i in range(32)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(store.save, frames))
+
+    # The metadata describes the file that ended up on disk
+    assert store.version == len(frames)
+    assert store.rows == pq.read_metadata(store.path).num_rows
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,35 @@
+"""Tests for parsing DEAP expressions into SymPy."""
+import pytest
+import sympy as sp
+
+from gp.equation_formatter import deap_to_sympy
+
+x, y, v0, v1 = sp.symbols("x y v0 v1")
+
+
+# Expected results are what the previous parse_expr-based converter returned
+@pytest.mark.parametrize("expr_str, expected", [
+    ("add(mul(x, 2.5), sub(x, 1))", sp.Float(3.5) * x - 1),
+    ("protected_div(x, safe_add(x, 1.0))", x / (x + sp.Float(1.0))),
+    ("div(sin(v0), sqrt(v1))", sp.sin(v0) / sp.sqrt(v1)),
+    ("add(mul(v0, v0), -1.23)", v0 ** 2 + sp.Float("-1.23")),
+    ("log(exp(x))", sp.log(sp.exp(x), evaluate=False)),
+    ("pow(x, 2)", x ** 2),
+    ("abs(sub(x, 3))", sp.Abs(x - 3)),
+    ("add(x, 1e-05)", x + sp.Float("1e-05")),
+    ("add(x, 2.0000000000000004)", x + sp.Float("2.0000000000000004")),
+    ("mul(ARG0, x9)", sp.Symbol("x_0") * sp.Symbol("x_9")),
+    ("safe_mul(protected_log(x), protected_exp(y))", sp.log(x) * sp.exp(y)),
+    ("cos(tan(sub(x, y)))", sp.cos(sp.tan(x - y))),
+    ("sub(x, x)", sp.Integer(0)),
+    ("x", x),
+    ("-3.5", sp.Float("-3.5")),
+])
+def test_deap_to_sympy(expr_str, expected):
+    result = deap_to_sympy(expr_str)
+    assert sp.srepr(result) == sp.srepr(expected)
+
+
+@pytest.mark.parametrize("expr_str", ["", "add(x", "add(x))", "add(x, $)"])
+def test_deap_to_sympy_malformed(expr_str):
+    assert deap_to_sympy(expr_str) is None
@@ -0,0 +1,37 @@
+"""Tests for fitness evaluation."""
+import numpy as np
+import pytest
+from deap import base, gp
+
+from gp.fitness import evaluate_on_split
+from gp.primitives import create_primitive_set
+
+
+@pytest.fixture(scope="module")
+def toolbox():
+    pset = create_primitive_set(2, ["x", "y"], ["+", "*"], [])
+    toolbox = base.Toolbox()
+    toolbox.register("compile", gp.compile, pset=pset)
+    toolbox.pset = pset
+    return toolbox
+
+
+def test_evaluate_on_split(toolbox):
+    individual = gp.PrimitiveTree.from_string("add(mul(x, x), y)", toolbox.pset)
+    X = np.arange(20.0).reshape(10, 2)
+    y = X[:, 0] ** 2 + X[:, 1]
+
+    result = evaluate_on_split(individual, toolbox, X[:7], y[:7], X[7:], y[7:])
+    assert result["train"]["mse"] == 0.0
+    assert result["test"]["mse"] == 0.0
+    assert result["complexity"] == 5
+
+
+def test_evaluate_on_split_empty_test(toolbox):
+    individual = gp.PrimitiveTree.from_string("add(mul(x, x), y)", toolbox.pset)
+    X = np.arange(20.0).reshape(10, 2)
+    y = X[:, 0] ** 2 + X[:, 1]
+
+    result = evaluate_on_split(individual, toolbox, X, y, X[:0], y[:0])
+    assert result["train"]["mse"] == 0.0
+    assert result["train"]["r_squared"] == 1.0
@@ -0,0 +1,101 @@
+"""Tests for the postfix interpreter against DEAP's compiled trees."""
+import random
+import warnings
+
+import numpy as np
+import pytest
+from deap import gp
+
+from gp.interpreter import (
+    OPCODE_TABLE,
+    apply_binary,
+    apply_unary,
+    compile_postfix,
+    eval_postfix,
+    predict_postfix,
+    to_columns,
+)
+from gp.primitives import FUNCTION_MAP, OPERATOR_MAP, create_primitive_set
+
+# Trig arguments above this magnitude turn last-bit differences between
+# NumPy and math (in exp, pow, ...) into unrelated results
+TRIG_ARG_LIMIT = 1e4
+
+
+@pytest.fixture(scope="module")
+def pset():
+    return create_primitive_set(2, ["x", "y"], list(OPERATOR_MAP), list(FUNCTION_MAP))
+
+
+@pytest.fixture(scope="module")
+def samples():
+    rng = np.random.default_rng(0)
+    edge_cases = [[0.0, 0.0], [1e-12, -1e-12], [1e6, -1e6]]
+    return np.concatenate([rng.uniform(-10, 10, (40, 2)), edge_cases])
+
+
+def _compiled_predictions(tree, pset, X):
+    """Per-sample predictions of gp.compile, cleaned up like predict_postfix."""
+    func = gp.compile(tree, pset)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        predictions = np.array([func(*row) for row in X], dtype=np.float64)
+    predictions = np.where(np.isfinite(predictions), predictions, 0.0)
+    return np.clip(predictions, -1e10, 1e10)
+
+
+def _ill_conditioned(tree, arg_index, columns, n_samples):
+    """Samples where some sin/cos/tan node gets a huge (or non-finite) argument."""
+    mask = np.zeros(n_samples, dtype=bool)
+    for i, node in enumerate(tree):
+        if node.name in ("sin", "cos", "tan"):
+            argument = gp.PrimitiveTree(tree[tree.searchSubtree(i + 1)])
+            values = eval_postfix(*compile_postfix(argument, arg_index), columns, n_samples)
+            mask |= ~(np.abs(values) < TRIG_ARG_LIMIT)
+    return mask
+
+
+def test_predict_postfix_matches_compiled_trees(pset, samples):
+    arg_index = {name: i for i, name in enumerate(pset.arguments)}
+    columns = to_columns(samples)
+    random.seed(0)
+
+    for _ in range(500):
+        tree = gp.PrimitiveTree(gp.genHalfAndHalf(pset, min_=1, max_=6))
+        expected = _compiled_predictions(tree, pset, samples)
+        predictions = predict_postfix(*compile_postfix(tree, arg_index), columns, len(samples))
+
+        compared = ~_ill_conditioned(tree, arg_index, columns, len(samples))
+        np.testing.assert_allclose(
+            predictions[compared], expected[compared], rtol=1e-9, atol=1e-9, err_msg=str(tree)
+        )
+
+
+def test_predict_postfix_constant_program(pset, samples):
+    tree = gp.PrimitiveTree.from_string("add(1.5, 2.0)", pset)
+    predictions = predict_postfix(*compile_postfix(tree, {}), to_columns(samples), len(samples))
+    assert predictions.shape == (len(samples),)
+    assert np.all(predictions == 3.5)
+
+
+ELEMENT_VALUES = [
+    0.0, -0.0, 1e-11, -1e-11, 0.5, -0.5, 1.0, -1.0, 2.0, -3.7, 30.0, 31.0, -31.0,
+    700.0, 1e10, 1e11, -1e11, np.pi / 2, np.inf, -np.inf, np.nan,
+]
+
+
+@pytest.mark.parametrize("code", range(len(OPCODE_TABLE)), ids=[name for name, _, _ in OPCODE_TABLE])
+def test_element_primitives_match_vectorized(code):
+    """apply_binary/apply_unary (compiled by the numba kernels) match the np_* primitives."""
+    _, func, arity = OPCODE_TABLE[code]
+    values = np.array(ELEMENT_VALUES)
+    if arity == 1:
+        with np.errstate(all='ignore'):
+            expected = func(values.copy())
+        results = [apply_unary(code, value) for value in ELEMENT_VALUES]
+    else:
+        a, b = (grid.ravel() for grid in np.meshgrid(values, values))
+        with np.errstate(all='ignore'):
+            expected = func(a.copy(), b.copy())
+        results = [apply_binary(code, first, second) for first, second in zip(a, b)]
+    np.testing.assert_allclose(np.array(results, dtype=np.float64), expected, rtol=1e-12)
@@ -0,0 +1,59 @@
+"""Tests for the numba batch kernel against the NumPy interpreter."""
+import random
+
+import numpy as np
+import pytest
+from deap import gp
+
+pytest.importorskip("numba")
+
+from gp.interpreter import compile_postfix, predict_postfix, to_columns  # noqa: E402
+from gp.jit_interpreter import jit_batch_mse  # noqa: E402
+from gp.primitives import OPERATOR_MAP, create_primitive_set  # noqa: E402
+
+# Without trig functions: NumPy and the compiled math differ in the last bit,
+# which sin/cos/tan of large arguments turn into unrelated results
+FUNCTIONS = ["sqrt", "log", "exp", "abs"]
+
+
+@pytest.fixture(scope="module")
+def pset():
+    return create_primitive_set(2, ["x", "y"], list(OPERATOR_MAP), FUNCTIONS)
+
+
+@pytest.fixture(scope="module")
+def programs(pset):
+    arg_index = {name: i for i, name in enumerate(pset.arguments)}
+    random.seed(0)
+    return [
+        compile_postfix(gp.PrimitiveTree(gp.genHalfAndHalf(pset, min_=1, max_=6)), arg_index)
+        for _ in range(300)
+    ]
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.uniform(-10, 10, (200, 2))
+    return X, X[:, 0] ** 2 - X[:, 1]
+
+
+def test_jit_batch_mse_matches_numpy(programs, data):
+    X, y = data
+    columns = to_columns(X)
+    expected = [
+        np.mean((predict_postfix(code, consts, columns, len(y)) - y) ** 2)
+        for code, consts in programs
+    ]
+    np.testing.assert_allclose(jit_batch_mse(programs, columns, y), expected, rtol=1e-7)
+
+
+def test_jit_batch_mse_reads_float32_as_is(programs, data):
+    X, y = data
+    X32, y32 = X.astype(np.float32), y.astype(np.float32)
+    # The kernel widens each value it reads, so float32 data gives the same
+    # result as the same values passed as float64
+    np.testing.assert_array_equal(
+        jit_batch_mse(programs, to_columns(X32), y32),
+        jit_batch_mse(programs, to_columns(X32.astype(np.float64)), y32.astype(np.float64)),
+    )
@@ -18,7 +18,7 @@ import {
 } from "recharts";
 import Link from "next/link";
 import { Play, Square, Trophy, Dna, Target, Database, Clock, Zap, AlertTriangle, Scale, Sparkles, TrendingUp } from "lucide-react";
-import { useAppStore, Candidate, GenerationStats, selectIsReady } from "@/lib/store";
+import { useAppStore, Candidate, GenerationStats, selectIsReady, applyCandidateDelta } from "@/lib/store";
 import { api } from "@/lib/api";
 import { cn } from "@/lib/utils";
 import { EquationDisplay, EquationCompact } from "@/components/EquationDisplay";
@@ -136,6 +136,8 @@ export default function ResultsPage() {
       elapsed_time?: number;
       stats?: ExtendedStats;
       hall_of_fame?: ExtendedCandidate[];
+      hof_add?: ExtendedCandidate[];
+      hof_order?: string[];
       pareto_front?: ExtendedCandidate[];
       best?: ExtendedCandidate;
     };
@@ -148,9 +150,16 @@ export default function ResultsPage() {
         if (msg.stats?.generations_per_second) setGenPerSec(msg.stats.generations_per_second);
         if (msg.stats) setCurrentStats(msg.stats);
 
+        // The socket keeps this handler from connect time, so read the
+        // live list from the store rather than the closed-over state
         updateEvolution({
           currentGeneration: msg.generation || 0,
-          hallOfFame: msg.hall_of_fame || evolution.hallOfFame,
+          hallOfFame: applyCandidateDelta(
+            useAppStore.getState().evolution.hallOfFame as ExtendedCandidate[],
+            msg.hall_of_fame,
+            msg.hof_add,
+            msg.hof_order
+          ),
         });
         if (msg.stats) {
           addGenerationStats(msg.stats);
@@ -161,7 +170,7 @@ export default function ResultsPage() {
       case "evolution_stopped":
         setEvolutionStatus("completed");
         updateEvolution({
-          hallOfFame: msg.hall_of_fame || evolution.hallOfFame,
+          hallOfFame: msg.hall_of_fame || useAppStore.getState().evolution.hallOfFame,
           paretoFront: msg.pareto_front || [],
         });
         break;
@@ -170,7 +179,7 @@ export default function ResultsPage() {
         setEvolutionStatus("error");
         break;
     }
-  }, [evolution, updateEvolution, addGenerationStats, setEvolutionStatus]);
+  }, [updateEvolution, addGenerationStats, setEvolutionStatus]);
 
   const handleStop = async () => {
     if (!evolution.sessionId) return;
@@ -1,7 +1,7 @@
 "use client";
 
 import { useEffect, useRef, useCallback, useState } from "react";
-import { useAppStore, Candidate } from "@/lib/store";
+import { useAppStore, Candidate, applyCandidateDelta } from "@/lib/store";
 
 interface EvolutionMessage {
   type: string;
@@ -18,6 +18,8 @@ interface EvolutionMessage {
   };
   best?: Candidate;
   hall_of_fame?: Candidate[];
+  hof_add?: Candidate[];
+  hof_order?: string[];
   pareto_front?: Candidate[];
   status?: string;
   message?: string;
@@ -86,7 +88,12 @@ export function useEvolutionWebSocket() {
         updateEvolution({
           currentGeneration: message.generation || 0,
           totalGenerations: message.total_generations || 0,
-          hallOfFame: message.hall_of_fame || [],
+          hallOfFame: applyCandidateDelta(
+            useAppStore.getState().evolution.hallOfFame,
+            message.hall_of_fame,
+            message.hof_add,
+            message.hof_order
+          ),
           generationStats: message.stats 
             ? [...useAppStore.getState().evolution.generationStats, message.stats]
             : useAppStore.getState().evolution.generationStats,
@@ -42,6 +42,28 @@ export interface Candidate {
   r_squared: number;
 }
 
+/**
+ * Apply a candidate-list delta from a generation update.
+ * The backend sends the full list when a client joins, then only changes:
+ * new candidates plus the new order (keyed by equation).
+ */
+export function applyCandidateDelta<T extends Candidate>(
+  previous: T[],
+  full?: T[],
+  added?: T[],
+  order?: string[]
+): T[] {
+  if (full) return full;
+  if (!order) return previous;
+
+  const byEquation = new Map(previous.map((c) => [c.equation, c]));
+  added?.forEach((c) => byEquation.set(c.equation, c));
+  return order.flatMap((equation) => {
+    const candidate = byEquation.get(equation);
+    return candidate ? [candidate] : [];
+  });
+}
+
 export interface GenerationStats {
   generation: number;
   best_fitness: number;